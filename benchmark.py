@@ -0,0 +1,280 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple, Optional
+
+import numpy as np
+import pygame
+
+from game import Board, BoardConfig, WindowConfig, StepEngines, Renderers, BoardFormats
+from game.life import create_grid
+from game.life.formats import FORMAT_EXTENSIONS
+
+
+# Hashlife rebuilds the board window every generation, so it is only measured
+# on small boards a generation at a time. The advance benchmark measures its jumps.
+HASHLIFE_ENGINE_MAX_CELLS = 256 * 256
+
+# Fields that identify a benchmark case when comparing two result files
+CASE_FIELDS = ("benchmark", "engine", "renderer", "format", "pattern", "columns", "rows", "density",
+               "generations")
+
+
+def measure(function: Callable[[], None], min_time: float, max_repeats: int = 10000) -> Tuple[int, float]:
+    """Calls the function until min_time has passed.
+
+    :return: Number of calls and seconds per call
+    """
+    function()
+
+    repeats = 0
+    start = perf_counter()
+    while repeats < max_repeats:
+        function()
+        repeats += 1
+        if perf_counter() - start >= min_time:
+            break
+
+    return repeats, (perf_counter() - start) / repeats
+
+
+def peak_memory(function: Callable[[], None]) -> int:
+    """Peak bytes allocated by Python and NumPy during a single call"""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def random_state(columns: int, rows: int, density: float, seed: int = 0) -> np.ndarray:
+    return (np.random.default_rng(seed).random((columns, rows)) < density).astype(np.uint8)
+
+
+def patterns(sizes: List[int], densities: List[float]):
+    """Iterates over the boards to measure, as (pattern, columns, rows, density, state)"""
+    board = Board(BoardConfig.WIDTH, BoardConfig.HEIGHT, BoardConfig.CELL_SIDE, WindowConfig.BOARD_WINDOW)
+    board.load_board(BoardConfig.BOARDS_DIR / "glider_gun.csv")
+    yield "glider_gun.csv", BoardConfig.WIDTH, BoardConfig.HEIGHT, None, board.grid.state
+
+    for size in sizes:
+        for density in densities:
+            yield "random", size, size, density, random_state(size, size, density)
+
+
+def case(benchmark: str, pattern: str, columns: int, rows: int, density: Optional[float], **fields) -> Dict:
+    result = {"benchmark": benchmark, "pattern": pattern, "columns": columns, "rows": rows, "density": density}
+    result.update(fields)
+    return result
+
+
+def benchmark_init(sizes: List[int], min_time: float) -> List[Dict]:
+    results = []
+    for size in sizes:
+        def create():
+            Board(size, size, BoardConfig.CELL_SIDE, WindowConfig.BOARD_WINDOW)
+
+        repeats, seconds = measure(create, min_time)
+        results.append(case("init", "empty", size, size, None, repeats=repeats, seconds=seconds,
+                            cells_per_second=size * size / seconds, peak_memory_bytes=peak_memory(create)))
+
+    return results
+
+
+def benchmark_update_state(sizes: List[int], densities: List[float], engines: List[str],
+                           min_time: float, work_dir: Path) -> List[Dict]:
+    results = []
+    for pattern, columns, rows, density, state in patterns(sizes, densities):
+        for engine in engines:
+            if engine == StepEngines.HASHLIFE.name and columns * rows > HASHLIFE_ENGINE_MAX_CELLS:
+                continue
+
+            grid_file = work_dir / f"benchmark_{pattern}_{columns}x{rows}_{density}.grid"
+            board = Board(columns, rows, BoardConfig.CELL_SIDE, WindowConfig.BOARD_WINDOW,
+                          engine=engine, grid_file=grid_file)
+            board.grid.state = state.copy()
+
+            repeats, seconds = measure(board.update_state, min_time)
+            memory = peak_memory(board.update_state)
+            board.grid.close()
+
+            results.append(case("update_state", pattern, columns, rows, density, engine=engine,
+                                repeats=repeats, seconds=seconds, generations_per_second=1 / seconds,
+                                cells_per_second=columns * rows / seconds, peak_memory_bytes=memory))
+
+    return results
+
+
+def benchmark_advance(engines: List[str], generations: int, min_time: float, work_dir: Path) -> List[Dict]:
+    """Advances the glider gun many generations in a single call, which Hashlife
+    jumps over at once and the other engines step one at a time"""
+    results = []
+    columns, rows = BoardConfig.WIDTH, BoardConfig.HEIGHT
+    for engine in engines:
+        grid = create_grid(columns, rows, engine, work_dir / f"advance_{engine}.grid")
+        grid.load_board(BoardConfig.BOARDS_DIR / "glider_gun.csv")
+
+        def advance():
+            grid.advance(generations)
+
+        repeats, seconds = measure(advance, min_time)
+        memory = peak_memory(advance)
+        grid.close()
+
+        results.append(case("advance", "glider_gun.csv", columns, rows, None, engine=engine,
+                            generations=generations, repeats=repeats, seconds=seconds,
+                            generations_per_second=generations / seconds,
+                            cells_per_second=columns * rows * generations / seconds, peak_memory_bytes=memory))
+
+    return results
+
+
+def benchmark_render(sizes: List[int], densities: List[float], renderers: List[str],
+                     min_time: float) -> List[Dict]:
+    """Renders boards that change every frame, alternating between two generations"""
+    results = []
+    window = pygame.Surface(WindowConfig.GAME_WINDOW)
+    for pattern, columns, rows, density, state in patterns(sizes, densities):
+        for renderer in renderers:
+            board = Board(columns, rows, BoardConfig.CELL_SIDE, WindowConfig.BOARD_WINDOW,
+                          engine=StepEngines.VECTORIZED.name, renderer=renderer)
+            board.grid.state = state.copy()
+            board.update_state()
+            generations = [state, board.grid.state]
+            frame = [0]
+
+            def render():
+                frame[0] += 1
+                board.grid.state = generations[frame[0] % 2]
+                board.render(window, (WindowConfig.MENU_WINDOW[0], 0))
+
+            repeats, seconds = measure(render, min_time)
+            visible_columns, visible_rows = board.visible_cells
+            results.append(case("render", pattern, columns, rows, density, renderer=renderer,
+                                repeats=repeats, seconds=seconds, frames_per_second=1 / seconds,
+                                cells_per_second=visible_columns * visible_rows / seconds,
+                                peak_memory_bytes=peak_memory(render)))
+
+    return results
+
+
+def benchmark_io(sizes: List[int], densities: List[float], board_formats: List[str],
+                 min_time: float, work_dir: Path) -> List[Dict]:
+    extensions = {board_format: extension for extension, board_format in FORMAT_EXTENSIONS.items()}
+
+    results = []
+    for pattern, columns, rows, density, state in patterns(sizes, densities):
+        board = Board(columns, rows, BoardConfig.CELL_SIDE, WindowConfig.BOARD_WINDOW,
+                      engine=StepEngines.VECTORIZED.name)
+        board.grid.state = state.copy()
+        for board_format in board_formats:
+            board_file = work_dir / f"benchmark{extensions[board_format]}"
+
+            def save():
+                board.save_board(board_file)
+
+            def load():
+                board.load_board(board_file)
+
+            for benchmark, function in (("save_board", save), ("load_board", load)):
+                repeats, seconds = measure(function, min_time)
+                results.append(case(benchmark, pattern, columns, rows, density, format=board_format,
+                                    repeats=repeats, seconds=seconds, cells_per_second=columns * rows / seconds,
+                                    file_bytes=board_file.stat().st_size, peak_memory_bytes=peak_memory(function)))
+
+    return results
+
+
+def case_key(result: Dict) -> Tuple:
+    return tuple(result.get(field) for field in CASE_FIELDS)
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> int:
+    """Prints how much slower or faster every case is than in the baseline.
+
+    :return: Number of cases slower than the baseline by more than the tolerance
+    """
+    baseline_cases = {case_key(result): result for result in baseline}
+    regressions = 0
+    for result in results:
+        previous = baseline_cases.get(case_key(result))
+        if previous is None:
+            continue
+
+        ratio = result["seconds"] / previous["seconds"]
+        regressed = ratio > 1 + tolerance
+        regressions += regressed
+        print(f"{'REGRESSION ' if regressed else ''}{format_case(result)}: {ratio:.2f}x the baseline time")
+
+    return regressions
+
+
+def format_case(result: Dict) -> str:
+    fields = [str(result[field]) for field in CASE_FIELDS if result.get(field) is not None]
+    return " ".join(fields)
+
+
+def main():
+    """Measures stepping, rendering, board I/O and board creation, and writes the
+    results as JSON so different engines and versions can be compared"""
+    parser = argparse.ArgumentParser(description="Game of Life benchmarks")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.3, 0.5])
+    parser.add_argument("--engines", nargs="+", default=[engine.name for engine in StepEngines],
+                        choices=[engine.name for engine in StepEngines])
+    parser.add_argument("--renderers", nargs="+", default=[renderer.name for renderer in Renderers],
+                        choices=[renderer.name for renderer in Renderers])
+    parser.add_argument("--formats", nargs="+", default=[board_format.name for board_format in BoardFormats],
+                        choices=[board_format.name for board_format in BoardFormats])
+    parser.add_argument("--benchmarks", nargs="+", default=["init", "update_state", "advance", "render", "io"],
+                        choices=["init", "update_state", "advance", "render", "io"])
+    parser.add_argument("--advance-generations", type=int, default=2 ** 10,
+                        help="Generations the glider gun is advanced by in every call of the advance benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds every case is repeated for")
+    parser.add_argument("--compare", type=Path, help="Results file of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Fraction of extra time that counts as a regression")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        if "init" in args.benchmarks:
+            results += benchmark_init(args.sizes, args.min_time)
+        if "update_state" in args.benchmarks:
+            results += benchmark_update_state(args.sizes, args.densities, args.engines, args.min_time, work_dir)
+        if "advance" in args.benchmarks:
+            results += benchmark_advance(args.engines, args.advance_generations, args.min_time, work_dir)
+        if "render" in args.benchmarks:
+            results += benchmark_render(args.sizes, args.densities, args.renderers, args.min_time)
+        if "io" in args.benchmarks:
+            results += benchmark_io(args.sizes, args.densities, args.formats, args.min_time, work_dir)
+
+    for result in results:
+        print(f"{format_case(result)}: {result['seconds'] * 1000:.3f} ms, "
+              f"{result['cells_per_second']:.3g} cells/s, {result['peak_memory_bytes'] / 2 ** 20:.1f} MB peak")
+
+    report = {"python": sys.version.split()[0], "numpy": np.__version__, "pygame": pygame.version.ver,
+              "platform": platform.platform(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,24 @@
+from importlib import import_module
+
 from .configs import Colors, WindowConfig, MenuLayout, Actions, BoardConfig
-from .cell import Cell
-from .board import Board
-from .engine import Engine
+from .configs import StepEngines, Renderers, BoardFormats, Boundaries
+
+# Imported on first access, so importing the package doesn't load pygame,
+# tkinter or numpy. Headless runs and worker processes only import the
+# modules they use.
+LAZY_ATTRIBUTES = {"Board": "game.board",
+                   "Scheduler": "game.scheduler",
+                   "Engine": "game.engine"}
+
+
+def __getattr__(name: str):
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(LAZY_ATTRIBUTES))
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import Optional
+from time import perf_counter
+
+from game.configs import BoardConfig, StepEngines
+from game.life import Grid, Rule, CONWAY, create_grid
+
+
+def resolve_board_file(board_file: Path) -> Path:
+    """Looks for the board file as given, and then inside the boards directory."""
+    board_file = Path(board_file)
+    if not board_file.exists() and (BoardConfig.BOARDS_DIR / board_file).exists():
+        return BoardConfig.BOARDS_DIR / board_file
+
+    return board_file
+
+
+def run_batch(board_file: Path, generations: int, output_file: Path,
+              columns: int = BoardConfig.WIDTH, rows: int = BoardConfig.HEIGHT,
+              engine: str = BoardConfig.ENGINE, grid_file: Optional[Path] = None,
+              stop_on_cycle: bool = False, rule: Rule = CONWAY,
+              boundary: str = BoardConfig.BOUNDARY) -> Grid:
+    """Runs a board for a number of generations without a display, as fast as
+    the engine allows, and saves the final generation. The HASHLIFE engine
+    jumps over all the generations in a single call. When stop_on_cycle is
+    set and the board becomes periodic, the generations left are reduced
+    modulo the period, so the final board is the same without simulating them.
+
+    :param board_file: The board to load, as a path or a file name in the boards directory
+    :param generations: Number of generations to run
+    :param output_file: Where the final board will be saved
+    :param columns: Number of cells in the horizontal axis
+    :param rows: Number of cells in the vertical axis
+    :param engine: The name of the StepEngines member used to advance the board
+    :param grid_file: The file that holds the state of memory mapped grids
+    :param stop_on_cycle: Whether to detect when the board becomes periodic, not
+        supported by the MEMMAP engine, whose board may not fit in memory
+    :param rule: The Life-like rule the engine applies
+    :param boundary: The name of the Boundaries member of the board edges
+    :return: The grid in its final state
+    """
+    if stop_on_cycle and engine == StepEngines.MEMMAP.name:
+        raise ValueError("Cycle detection keeps a dense copy of the board, it can't be used with the MEMMAP engine")
+
+    grid = create_grid(columns, rows, engine, grid_file, rule, boundary)
+    grid.load_board(resolve_board_file(board_file))
+
+    if stop_on_cycle:
+        grid.enable_cycle_detection(BoardConfig.CYCLE_GENERATIONS)
+
+    start = perf_counter()
+    simulated = 0
+    if not stop_on_cycle:
+        grid.advance(generations)
+        simulated = generations
+
+    while simulated < generations:
+        grid.update_state()
+        simulated += 1
+
+        if grid.cycles.period is not None:
+            period = grid.cycles.period
+            print(f"Periodic from generation {grid.cycles.cycle_start} with period {period}")
+            remaining = (generations - simulated) % period
+            grid.advance(remaining)
+            simulated += remaining
+            break
+    elapsed = perf_counter() - start
+
+    grid.save_board(output_file)
+    grid.close()
+
+    rate = simulated / elapsed if elapsed > 0 else float("inf")
+    print(f"{simulated} generations in {elapsed:.3f}s ({rate:.1f} gen/s), "
+          f"final population {grid.population}")
+
+    return grid
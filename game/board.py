@@ -1,145 +1,275 @@
-import csv
-from typing import Tuple, Set, Dict
+from typing import Tuple, Set, List, Optional
 from pathlib import Path
 
 import numpy as np
+import pygame
 from pygame import Surface
 
-from game.cell import Cell
-from game.configs import Colors
-
-
-class CellPosition(object):
-    """Stores a cell position in a board, in units"""
-
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
-
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
-
-    def __hash__(self):
-        return hash(self.__repr__())
-
-    def __repr__(self):
-        return f"CellPosition( x = {self.x}, y = {self.y} )"
-
-    def as_tuple(self) -> Tuple[int, int]:
-        return self.x, self.y
-
-
-def get_position_neighbours(position: 'CellPosition') -> Set['CellPosition']:
-    neighbours: Set[CellPosition] = {
-        CellPosition(position.x - 1, position.y - 1),
-        CellPosition(position.x, position.y - 1),
-        CellPosition(position.x + 1, position.y - 1),
-        CellPosition(position.x + 1, position.y),
-        CellPosition(position.x + 1, position.y + 1),
-        CellPosition(position.x, position.y + 1),
-        CellPosition(position.x - 1, position.y + 1),
-        CellPosition(position.x - 1, position.y)}        # Left
-
-    return neighbours
+from game.configs import Colors, StepEngines, BoardConfig, Renderers, Boundaries
+from game.life import CellPosition, Rule, CONWAY, create_grid
 
 
 class Board(object):
 
     def __init__(self, columns: int, rows: int, cell_side: int,
-                 window_size: Tuple[int, int]):
-
-        self.columns = columns
-        self.rows = rows
-        self.cell_side = cell_side
+                 window_size: Tuple[int, int], engine: str = StepEngines.CELLS.name,
+                 renderer: str = Renderers.RECTS.name, grid_file: Optional[Path] = None,
+                 rule: Rule = CONWAY, boundary: str = Boundaries.DEAD.name):
+        """Renders a headless Grid into a pygame surface and maps clicks to its cells.
+
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param cell_side: The initial side of every cell in pixels, a fraction when
+            zoomed out so several cells share a pixel
+        :param window_size: The size of the board window in pixels
+        :param engine: The name of the StepEngines member used to advance the board
+        :param renderer: The name of the Renderers member used to draw the board
+        :param grid_file: The file that holds the state with StepEngines.MEMMAP
+        :param rule: The Life-like rule the engine applies
+        :param boundary: The name of the Boundaries member of the board edges
+        """
+        self.grid = create_grid(columns, rows, engine, grid_file, rule, boundary)
         self.window_size = window_size
+        self.renderer = renderer
 
-        self.window = Surface(window_size)
-        self.window.fill(Colors.BLACK)
+        # The board cell drawn on the top left corner of the window
+        self.view_x = 0
+        self.view_y = 0
 
-        self.board: np.array = np.array([
-            [Cell(self.cell_side, (row * cell_side, column * cell_side))
-             for column in range(rows)]
-            for row in range(columns)
-        ])
+        # The surface is created on the first render, so headless boards never touch pygame
+        self.window: Optional[Surface] = None
 
-        self.active_cells: Set[CellPosition] = set()
+        # The visible cells as they were last drawn, None forces a full redraw
+        self.rendered: Optional[np.ndarray] = None
 
-    def reset(self):
-        for cell_position in self.active_cells:
-            self.board[cell_position.as_tuple()].die()
+        self.apply_zoom(cell_side)
+
+    @property
+    def columns(self) -> int:
+        return self.grid.columns
+
+    @property
+    def rows(self) -> int:
+        return self.grid.rows
+
+    @property
+    def active_cells(self) -> Set[CellPosition]:
+        return self.grid.active_cells
+
+    @property
+    def renderers(self):
+        return {Renderers.RECTS.name: self.render_rects,
+                Renderers.SURFARRAY.name: self.render_surfarray}
 
-    def render(self, window: Surface, position: Tuple[int, int]):
+    @property
+    def window_cells(self) -> Tuple[int, int]:
+        """Number of columns and rows that fit, even partially, in the window"""
+        window_columns = -(-self.window_size[0] // self.cell_side) * self.cells_per_pixel
+        window_rows = -(-self.window_size[1] // self.cell_side) * self.cells_per_pixel
+
+        return window_columns, window_rows
+
+    @property
+    def visible_cells(self) -> Tuple[int, int]:
+        """Number of columns and rows of the board shown from the view position"""
+        window_columns, window_rows = self.window_cells
+
+        return min(self.columns - self.view_x, window_columns), min(self.rows - self.view_y, window_rows)
+
+    def set_zoom(self, zoom: float):
+        """Changes the pixels per cell, keeping the cell in the centre of the view
+        in place. Zooms below one pixel per cell summarize several cells in a pixel.
+
+        :param zoom: The side of a cell in pixels, or a fraction 1 / n for n cells per pixel
+        """
+        visible_columns, visible_rows = self.visible_cells
+        centre_x, centre_y = self.view_x + visible_columns // 2, self.view_y + visible_rows // 2
+
+        self.apply_zoom(zoom)
+
+        window_columns, window_rows = self.window_cells
+        self.move_view(centre_x - window_columns // 2, centre_y - window_rows // 2)
+
+    def apply_zoom(self, zoom: float):
+        """Sets the cell size in pixels and the cells summarized by every pixel for a zoom"""
+        self.zoom = zoom
+        self.cell_side = max(int(zoom), 1)
+        self.cells_per_pixel = max(round(1 / zoom), 1)
+
+        # Cells too small for a border are drawn without the grid lines
+        side = self.cell_side
+        self.border = 1 if side >= 3 else 0
+        self.cell_mask = np.zeros((side, side), dtype=bool)
+        self.cell_mask[self.border:side - self.border, self.border:side - self.border] = True
+
+        self.rendered = None
+
+    def zoom_in(self):
+        closer = [zoom for zoom in BoardConfig.ZOOM_LEVELS if zoom > self.zoom]
+        if closer:
+            self.set_zoom(min(closer))
+
+    def zoom_out(self):
+        farther = [zoom for zoom in BoardConfig.ZOOM_LEVELS if zoom < self.zoom]
+        if farther:
+            self.set_zoom(max(farther))
+
+    def move_view(self, x: int, y: int):
+        """Moves the top left corner of the view to a cell, keeping the window inside the board"""
+        window_columns, window_rows = self.window_cells
+        x = min(max(x, 0), max(self.columns - window_columns, 0))
+        y = min(max(y, 0), max(self.rows - window_rows, 0))
+
+        if (x, y) != (self.view_x, self.view_y):
+            self.view_x, self.view_y = x, y
+            self.rendered = None
+
+    def pan(self, dx: int, dy: int):
+        """Moves the view a number of pixels, at the current zoom"""
+        self.move_view(self.view_x + dx * self.cells_per_pixel // self.cell_side,
+                       self.view_y + dy * self.cells_per_pixel // self.cell_side)
+
+    def allocate_surfaces(self):
+        """Creates the board surface, if it wasn't yet"""
+        if self.window is None:
+            self.window = Surface(self.window_size)
+
+    def cell_rect(self, x: int, y: int) -> pygame.Rect:
+        """The inner rectangle of a cell, without its border"""
+        return pygame.Rect(x * self.cell_side + self.border, y * self.cell_side + self.border,
+                           self.cell_side - 2 * self.border, self.cell_side - 2 * self.border)
+
+    def white_pixels(self, dead: np.ndarray) -> np.ndarray:
+        """Upscales the dead cells to pixels with the grid lines baked in.
+
+        :param dead: A boolean array of the visible cells, indexed as dead[x, y]
+        :return: A boolean array of pixels, indexed as pixels[x, y] and cropped to
+            the window, with True where the pixel is white
+        """
+        columns, rows = dead.shape
+        side = self.cell_side
+        pixels = dead[:, None, :, None] & self.cell_mask[None, :, None, :]
+        pixels = pixels.reshape(columns * side, rows * side)
+
+        return pixels[:self.window_size[0], :self.window_size[1]]
+
+    def draw_all_cells(self, visible: np.ndarray):
+        """Redraws every visible cell on the board surface in a single array operation"""
+        if self.rendered is None:
+            self.window.fill(Colors.BLACK)
+
+        self.blit_pixels(self.window, self.white_pixels(visible == 0))
+
+    @staticmethod
+    def blit_pixels(surface: Surface, white: np.ndarray):
+        """Draws white and black pixels on the top left of the surface in a single operation"""
+        colors = np.array([surface.map_rgb(Colors.BLACK), surface.map_rgb(Colors.WHITE)], dtype=np.uint32)
+        area = surface.subsurface(((0, 0), white.shape))
+        pygame.surfarray.blit_array(area, colors[white.view(np.uint8)])
 
-        [[cell.render(self.window) for cell in column] for column in self.board]
+    def reset(self):
+        self.grid.reset()
+
+    def render(self, window: Surface, position: Tuple[int, int]) -> List[pygame.Rect]:
+        """Draws the board with the selected renderer.
+
+        :param window: The surface to draw the board on
+        :param position: Where the board is placed in the window
+        :return: The rectangles of the window that changed
+        """
+        self.allocate_surfaces()
+        if self.cells_per_pixel > 1:
+            return self.render_density(window, position)
+
+        return self.renderers[self.renderer](window, position)
+
+    def visible_window(self) -> np.ndarray:
+        """The visible cells of the board, indexed as visible[x, y]"""
+        visible_columns, visible_rows = self.visible_cells
+        return self.grid.window(self.view_x, self.view_y, visible_columns, visible_rows)
+
+    def render_rects(self, window: Surface, position: Tuple[int, int]) -> List[pygame.Rect]:
+        """Draws one rectangle for every cell that changed since the last render.
+        When more than MAX_DIRTY_RECTS cells changed, the whole view is redrawn in
+        a single array operation instead."""
+        visible = self.visible_window()
+
+        changed = None if self.rendered is None else (visible != self.rendered).nonzero()
+        if changed is None or len(changed[0]) > BoardConfig.MAX_DIRTY_RECTS:
+            self.draw_all_cells(visible)
+            window.blit(self.window, position)
+
+            self.rendered = visible.copy()
+            return [self.window.get_rect(topleft=position)]
+
+        dirty_rects = []
+        for x, y in zip(*changed):
+            rect = self.cell_rect(x, y)
+            pygame.draw.rect(self.window, Colors.BLACK if visible[x, y] else Colors.WHITE, rect)
+            window.blit(self.window, rect.move(position), area=rect)
+            dirty_rects.append(rect.move(position))
+
+        self.rendered = visible.copy()
+        return dirty_rects
+
+    def render_surfarray(self, window: Surface, position: Tuple[int, int]) -> List[pygame.Rect]:
+        """Turns the visible cells into pixels in a single array operation, and
+        blits the whole board once if anything changed since the last render"""
+        visible = self.visible_window()
+
+        if self.rendered is not None and np.array_equal(visible, self.rendered):
+            return []
+
+        self.draw_all_cells(visible)
         window.blit(self.window, position)
 
-    def handle_click(self, x: int, y: int):
+        self.rendered = visible.copy()
+        return [self.window.get_rect(topleft=position)]
+
+    def render_density(self, window: Surface, position: Tuple[int, int]) -> List[pygame.Rect]:
+        """Draws every pixel in a shade of grey with the fraction of alive cells it
+        covers, when zoomed out so several cells share a pixel. Only the cells in
+        the window are read, so the cost depends on the window and not the board."""
+        factor = self.cells_per_pixel
+        visible = self.visible_window()
+        columns, rows = visible.shape
+        pixels_x, pixels_y = -(-columns // factor), -(-rows // factor)
+
+        blocks = np.zeros((pixels_x * factor, pixels_y * factor), dtype=np.uint8)
+        blocks[:columns, :rows] = visible
+        alive = blocks.reshape(pixels_x, factor, pixels_y, factor).sum(axis=(1, 3), dtype=np.int32)
+        shade = (255 - 255 * alive // (factor * factor)).astype(np.uint8)
+
+        if self.rendered is not None and np.array_equal(shade, self.rendered):
+            return []
+
+        if self.rendered is None:
+            self.window.fill(Colors.BLACK)
+        area = self.window.subsurface(((0, 0), shade.shape))
+        pygame.surfarray.blit_array(area, np.repeat(shade[:, :, None], 3, axis=2))
+        window.blit(self.window, position)
 
-        cell_x = int(x / self.cell_side)
-        cell_y = int(y / self.cell_side)
-        cell_position = CellPosition(cell_x, cell_y)
-
-        self.board[cell_position.as_tuple()].change_state()
-
-        if self.board[cell_position.as_tuple()].is_alive():
-            self.active_cells.add(CellPosition(cell_x, cell_y))
-        else:
-            self.active_cells.remove(CellPosition(cell_x, cell_y))
-
-    def get_alive_neighbours(self, position: CellPosition) -> int:
-        alive_neighbours = 0
-        for neighbour in get_position_neighbours(position):
-            if self.valid_position(neighbour):
-                alive_neighbours += int(self.board[neighbour.as_tuple()].is_alive())
-
-        return alive_neighbours
-    
-    def valid_position(self, position: CellPosition):
-        x_valid = 0 <= position.x < self.columns
-        y_valid = 0 <= position.y < self.rows
-        
-        return x_valid and y_valid
-    
-    def update_state(self):
-        cells_alive_neighbours: Dict[CellPosition, int] = {}
-        for active_cell in self.active_cells:
+        self.rendered = shade
+        return [self.window.get_rect(topleft=position)]
 
-            if active_cell not in cells_alive_neighbours:
-                cells_alive_neighbours[active_cell] = self.get_alive_neighbours(active_cell)
+    def handle_click(self, x: int, y: int):
 
-            for neighbour in get_position_neighbours(active_cell):
-                if neighbour not in cells_alive_neighbours and self.valid_position(neighbour):
-                    cells_alive_neighbours[neighbour] = self.get_alive_neighbours(neighbour)
+        cell = (self.view_x + x // self.cell_side * self.cells_per_pixel,
+                self.view_y + y // self.cell_side * self.cells_per_pixel)
+        if self.grid.valid_position(cell):
+            self.grid.change_state(*cell)
 
-        new_alive: Set[CellPosition] = set()
-        for cell_position, alive_neighbours in cells_alive_neighbours.items():
-            cell = self.board[cell_position.as_tuple()]
-            cell.update(alive_neighbours)
-            if cell.is_alive():
-                new_alive.add(cell_position)
+    def update_state(self):
+        self.grid.update_state()
 
-        self.active_cells = new_alive
+    def rewind(self, generations: int = 1):
+        self.grid.rewind(generations)
 
-    def load_board(self, board_file: Path):
-        self.reset()
-        with open(board_file, "r", newline="") as f:
-            reader = csv.reader(f)
+    def replace_state(self, state: np.ndarray):
+        self.grid.replace_state(state)
 
-            for y, row in enumerate(reader):
-                for x, value in enumerate(row):
-                    if value == "1":
-                        self.board[(x, y)].populate()
-                        self.active_cells.add(CellPosition(x, y))
+    def load_board(self, board_file: Path):
+        self.grid.load_board(board_file)
 
     def save_board(self, board_file: Path):
-        with open(board_file, "w", newline="") as f:
-            writer = csv.writer(f)
-
-            for y in range(self.rows):
-                write_row = []
-                for x in range(self.columns):
-                    if self.board[(x, y)].is_alive():
-                        write_row.append("1")
-                    else:
-                        write_row.append("0")
-                writer.writerow(write_row)
+        self.grid.save_board(board_file)
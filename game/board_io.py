@@ -0,0 +1,107 @@
+from pathlib import Path
+from threading import Thread
+from typing import Optional
+
+import numpy as np
+
+from game.configs import BoardConfig
+from game.life import formats
+from game.life.rules import Rule, CONWAY
+
+
+class BoardBuffer(object):
+
+    def __init__(self, columns: int, rows: int, state: Optional[np.ndarray] = None, rule: Rule = CONWAY):
+        """Dense board that a board file is read into or written from off the game
+        loop. It has the part of the Grid interface the board formats use, and
+        counts the rows they went through to report progress.
+
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param state: A snapshot of the board to write, an empty board if not given
+        :param rule: The rule of the board, written in and checked against RLE headers
+        """
+        self.columns = columns
+        self.rows = rows
+        self.rule = rule
+        self.state = state if state is not None else np.zeros((columns, rows), dtype=np.uint8)
+        self.done_rows = 0
+
+    @property
+    def progress(self) -> float:
+        return self.done_rows / self.rows if self.rows else 1.0
+
+    def reset(self):
+        self.state.fill(0)
+
+    def window(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        self.done_rows = min(y + rows, self.rows)
+        return self.state[x:x + columns, y:y + rows]
+
+    def set_rows(self, y: int, block: np.ndarray):
+        self.state[:, y:y + block.shape[1]] = block
+        self.done_rows = y + block.shape[1]
+
+
+def ask_board_path(save: bool) -> str:
+    """Shows a tkinter file dialog for a board file. Tk has to be used from the
+    main thread, so the dialog is shown before a BoardTask is started, with a
+    hidden root that is destroyed once it closes.
+
+    :param save: Whether to ask for a file to save instead of an existing one
+    :return: The chosen path, or an empty string if the dialog was cancelled
+    """
+    import tkinter as tk
+    from tkinter import filedialog
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        if save:
+            return filedialog.asksaveasfilename(parent=root, initialdir=BoardConfig.BOARDS_DIR,
+                                                filetypes=BoardConfig.FILE_TYPES, defaultextension=".csv")
+        return filedialog.askopenfilename(parent=root, initialdir=BoardConfig.BOARDS_DIR,
+                                          filetypes=BoardConfig.FILE_TYPES)
+    finally:
+        root.destroy()
+
+
+class BoardTask(Thread):
+
+    def __init__(self, buffer: BoardBuffer, save: bool, board_path: Path):
+        """Reads a board file into, or writes it from, a buffer on a worker thread,
+        so the game loop keeps running. The game loop polls the task and swaps a
+        loaded board in once the thread is done.
+
+        :param buffer: The board to read the file into, or the snapshot to write
+        :param save: Whether the buffer is written to the file instead of read from it
+        :param board_path: The board file, chosen with ask_board_path on the main thread
+        """
+        super().__init__(daemon=True)
+        self.buffer = buffer
+        self.save = save
+        self.board_path = Path(board_path)
+
+        self.error: Optional[Exception] = None
+
+    @property
+    def progress(self) -> float:
+        return self.buffer.progress
+
+    @property
+    def description(self) -> str:
+        return f"{'Saving' if self.save else 'Loading'} {self.progress:.0%}"
+
+    @property
+    def failure(self) -> str:
+        return f"Could not {'save' if self.save else 'load'} {self.board_path.name}: {self.error}"
+
+    def run(self):
+        try:
+            if self.save:
+                formats.write_board(self.buffer, self.board_path)
+            else:
+                formats.read_board(self.buffer, self.board_path)
+        except Exception as error:
+            # Reported by the game loop, once the task is polled
+            self.error = error
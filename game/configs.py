@@ -28,13 +28,74 @@ class Actions(Enum):
     INCREASE_SPEED = 9
     MAX_SPEED = 10
     OPEN_RULES = 11
+    REWIND = 12
+    STEP = 13
+    PAN_LEFT = 14
+    PAN_RIGHT = 15
+    PAN_UP = 16
+    PAN_DOWN = 17
+    ZOOM_IN = 18
+    ZOOM_OUT = 19
+
+
+class StepEngines(Enum):
+    CELLS = 0
+    VECTORIZED = 1
+    UNBOUNDED = 2
+    BITPACKED = 3
+    PARALLEL = 4
+    MEMMAP = 5
+    TILED = 6
+    HASHLIFE = 7
+
+
+class Boundaries(Enum):
+    DEAD = 0
+    TORUS = 1
+    MIRROR = 2
+
+
+class BoardFormats(Enum):
+    CSV = 0
+    RLE = 1
+    BINARY = 2
+
+
+class Renderers(Enum):
+    RECTS = 0
+    SURFARRAY = 1
 
 
 class BoardConfig:
     WIDTH = 40
     HEIGHT = 30
     CELL_SIDE = 20
+    # Pixels per cell selectable with the zoom keys, fractions summarize several cells in a pixel
+    ZOOM_LEVELS = (40, 20, 10, 5, 3, 2, 1, 1 / 2, 1 / 4, 1 / 8, 1 / 16)
+    # Pixels the view moves with every pan key press
+    PAN_PIXELS = 100
     FPS = 60
+    # Generations per second selectable with the speed buttons
+    SPEEDS = tuple(range(1, 21)) + (30, 50, 100, 200, 500)
+    # Seconds of stepping on the worker thread before the board is drawn again
+    STEP_BUDGET = 0.8 / FPS
+    HISTORY_BYTES = 64 * 2 ** 20
+    HISTORY_KEYFRAME_INTERVAL = 64
+    # Longest period the cycle detection remembers
+    CYCLE_GENERATIONS = 10000
+    # Frames the profiling metrics are averaged over
+    PROFILE_WINDOW = 120
+    MAX_DIRTY_RECTS = 200
+    RENDERER = Renderers.RECTS.name
+    ENGINE = StepEngines.VECTORIZED.name
+    # Life-like rule in B/S notation, or one of the names in game.life.rules.NAMED_RULES
+    RULE = "B3/S23"
+    BOUNDARY = Boundaries.DEAD.name
+    # Side in cells of the tiles the TILED engine skips while they are stable
+    TILE_SIDE = 32
+    BOARDS_DIR = Path("game/boards")
+    FILE_TYPES = [("Board files", "*.csv *.rle *.golb"), ("CSV board", "*.csv"),
+                  ("RLE pattern", "*.rle"), ("Binary board", "*.golb"), ("All files", "*")]
 
 
 class MenuLayout:
@@ -50,3 +111,6 @@ class MenuLayout:
     SPEED_LABEL_SIZE = (70, 25)
     SPEED_DISPLAY_SIZE = (70, 40)
     SPEED_BUTTONS_SIZE = (35, 25)
+    METRICS_DISPLAY_SIZE = (90, 115)
+    METRICS_POSITION = 410
+    METRICS_FONT_SIZE = 11
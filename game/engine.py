@@ -1,32 +1,70 @@
 import webbrowser
 import sys
-import tkinter as tk
-from tkinter import filedialog
-from time import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
 
 import pygame
 
-from game.configs import WindowConfig, Actions, BoardConfig
+from game.configs import WindowConfig, Actions, BoardConfig, StepEngines
+from game.batch import resolve_board_file
 from game.board import Board
-from game.menu import Menu, SpeedDisplay
+from game.board_io import BoardBuffer, BoardTask, ask_board_path
+from game.life import Rule
+from game.scheduler import Scheduler, StepTask
+from game.profiler import NullProfiler, FrameProfiler
+from game.menu import Menu, SpeedDisplay, MetricsDisplay
 
 
-root = tk.Tk()
-root.withdraw()
-pygame.init()
-pygame.display.set_caption("Game of Life")
+class Engine(object):
 
+    def __init__(self, profile: bool = False, metrics_callback: Optional[Callable[[Dict], None]] = None,
+                 metrics_file: Optional[Path] = None, rule: Optional[Rule] = None,
+                 boundary: str = BoardConfig.BOUNDARY, columns: int = BoardConfig.WIDTH,
+                 rows: int = BoardConfig.HEIGHT, engine: str = BoardConfig.ENGINE,
+                 grid_file: Optional[Path] = None, board_file: Optional[Path] = None):
+        """Runs the game window, the menu and the board.
 
-class Engine(object):
+        :param profile: Whether to time every phase of the frames and show the metrics in the menu
+        :param metrics_callback: Called with the profiling metrics at the end of every frame
+        :param metrics_file: Where the profiling metrics are saved as JSON when the game is closed
+        :param rule: The Life-like rule of the board, BoardConfig.RULE by default
+        :param boundary: The name of the Boundaries member of the board edges
+        :param columns: Number of cells in the horizontal axis of the board
+        :param rows: Number of cells in the vertical axis of the board
+        :param engine: The name of the StepEngines member used to advance the board
+        :param grid_file: The file that holds the board state with StepEngines.MEMMAP
+        :param board_file: A board to load at start, as a path or a file name in the boards directory
+        """
+        # The load or save running on a worker thread, only one at a time
+        self.board_task: Optional[BoardTask] = None
+        # The generations being stepped on a worker thread, the board is only
+        # read or changed by the game loop while no step task is running
+        self.step_task: Optional[StepTask] = None
+        pygame.init()
+        pygame.display.set_caption("Game of Life")
 
-    def __init__(self):
         self.window = pygame.display.set_mode(WindowConfig.GAME_WINDOW)
         self.current_speed = 5
         self.stopped_time = True
 
-        self.menu = Menu(size=WindowConfig.MENU_WINDOW, current_speed=self.current_speed)
-        self.board = Board(columns=BoardConfig.WIDTH, rows=BoardConfig.HEIGHT,
-                           cell_side=BoardConfig.CELL_SIDE, window_size=WindowConfig.BOARD_WINDOW)
+        self.metrics_file = metrics_file
+        if profile or metrics_callback is not None or metrics_file is not None:
+            self.profiler = FrameProfiler(BoardConfig.PROFILE_WINDOW, metrics_callback)
+        else:
+            self.profiler = NullProfiler()
+
+        self.menu = Menu(size=WindowConfig.MENU_WINDOW, current_speed=self.current_speed,
+                         show_metrics=profile)
+        self.board = Board(columns=columns, rows=rows,
+                           cell_side=BoardConfig.CELL_SIDE, window_size=WindowConfig.BOARD_WINDOW,
+                           engine=engine, renderer=BoardConfig.RENDERER, grid_file=grid_file,
+                           rule=rule or Rule.parse(BoardConfig.RULE), boundary=boundary)
+        if board_file is not None:
+            self.board.load_board(resolve_board_file(board_file))
+
+        # The history keeps a dense copy of the board, which a memory-mapped board may not fit in
+        if engine != StepEngines.MEMMAP.name:
+            self.board.grid.enable_history(BoardConfig.HISTORY_BYTES, BoardConfig.HISTORY_KEYFRAME_INTERVAL)
 
     @property
     def actions(self):
@@ -41,28 +79,62 @@ class Engine(object):
                 Actions.REDUCE_SPEED.name: self.decrease_speed,
                 Actions.INCREASE_SPEED.name: self.increase_speed,
                 Actions.MAX_SPEED.name: self.max_speed,
-                Actions.OPEN_RULES.name: self.open_rules
+                Actions.OPEN_RULES.name: self.open_rules,
+                Actions.REWIND.name: self.rewind,
+                Actions.STEP.name: self.step,
+                Actions.PAN_LEFT.name: self.pan_left,
+                Actions.PAN_RIGHT.name: self.pan_right,
+                Actions.PAN_UP.name: self.pan_up,
+                Actions.PAN_DOWN.name: self.pan_down,
+                Actions.ZOOM_IN.name: self.board.zoom_in,
+                Actions.ZOOM_OUT.name: self.board.zoom_out
                 }
 
+    @property
+    def key_actions(self):
+        return {pygame.K_LEFT: Actions.REWIND.name,
+                pygame.K_RIGHT: Actions.STEP.name,
+                pygame.K_a: Actions.PAN_LEFT.name,
+                pygame.K_d: Actions.PAN_RIGHT.name,
+                pygame.K_w: Actions.PAN_UP.name,
+                pygame.K_s: Actions.PAN_DOWN.name,
+                pygame.K_PLUS: Actions.ZOOM_IN.name,
+                pygame.K_EQUALS: Actions.ZOOM_IN.name,
+                pygame.K_MINUS: Actions.ZOOM_OUT.name}
+
+    def pan_left(self):
+        self.board.pan(-BoardConfig.PAN_PIXELS, 0)
+
+    def pan_right(self):
+        self.board.pan(BoardConfig.PAN_PIXELS, 0)
+
+    def pan_up(self):
+        self.board.pan(0, -BoardConfig.PAN_PIXELS)
+
+    def pan_down(self):
+        self.board.pan(0, BoardConfig.PAN_PIXELS)
+
     def min_speed(self):
-        self.current_speed = 1
+        self.current_speed = BoardConfig.SPEEDS[0]
         self.update_menu_speed()
 
     def decrease_speed(self):
-        if self.current_speed == 1:
+        slower = [speed for speed in BoardConfig.SPEEDS if speed < self.current_speed]
+        if not slower:
             return
-        self.current_speed -= 1
+        self.current_speed = slower[-1]
         self.update_menu_speed()
 
     def increase_speed(self):
-        if self.current_speed == 20:
+        faster = [speed for speed in BoardConfig.SPEEDS if speed > self.current_speed]
+        if not faster:
             return
 
-        self.current_speed += 1
+        self.current_speed = faster[0]
         self.update_menu_speed()
 
     def max_speed(self):
-        self.current_speed = 20
+        self.current_speed = BoardConfig.SPEEDS[-1]
         self.update_menu_speed()
 
     def update_menu_speed(self):
@@ -70,33 +142,132 @@ class Engine(object):
             if isinstance(entity, SpeedDisplay):
                 entity.current_speed = self.current_speed
 
+    def update_menu_metrics(self):
+        metrics = self.profiler.metrics()
+        for _, entity in self.menu.menu_manager.entities.items():
+            if isinstance(entity, MetricsDisplay):
+                entity.metrics = metrics
+
     def change_state(self):
         self.stopped_time = not self.stopped_time
 
     def save_board(self):
-        board_path = filedialog.asksaveasfilename(initialdir="game/boards")
-        if board_path != "":
-            self.board.save_board(board_path)
+        """Asks for a file and writes a snapshot of the current generation to it on a worker thread"""
+        if self.board_task is not None:
+            return
+
+        board_path = ask_board_path(save=True)
+        if board_path == "":
+            return
+
+        self.finish_step()
+        snapshot = BoardBuffer(self.board.columns, self.board.rows, self.board.grid.state.copy(),
+                               self.board.grid.rule)
+        self.board_task = BoardTask(snapshot, save=True, board_path=Path(board_path))
+        self.board_task.start()
 
     def load_board(self):
-        board_path = filedialog.askopenfilename(initialdir="game/boards")
-        if board_path != "":
-            self.board.load_board(board_path)
+        """Asks for a board file and reads it on a worker thread, the board is replaced once it is read"""
+        if self.board_task is not None:
+            return
+
+        board_path = ask_board_path(save=False)
+        if board_path == "":
+            return
+
+        buffer = BoardBuffer(self.board.columns, self.board.rows, rule=self.board.grid.rule)
+        self.board_task = BoardTask(buffer, save=False, board_path=Path(board_path))
+        self.board_task.start()
+
+    def poll_board_task(self):
+        """Shows the progress of the running load or save in the window title, and
+        swaps a loaded board in when the worker thread is done. A file that can't
+        be read or written is reported, and the game goes on with the same board."""
+        task = self.board_task
+        if task is None:
+            return
+
+        if task.is_alive():
+            pygame.display.set_caption(f"Game of Life - {task.description}")
+            return
+
+        self.board_task = None
+        if task.error is not None:
+            print(task.failure, file=sys.stderr)
+            pygame.display.set_caption(f"Game of Life - {task.failure}")
+            return
+
+        pygame.display.set_caption("Game of Life")
+        if not task.save:
+            self.finish_step()
+            self.board.replace_state(task.buffer.state)
+
+    def start_step(self, scheduler: Scheduler):
+        """Starts stepping the generations that are due on a worker thread"""
+        self.step_task = StepTask(scheduler, self.current_speed, self.board.update_state)
+        self.step_task.start()
+
+    def poll_step_task(self) -> int:
+        """Collects the step task once the worker thread is done. A generation
+        that failed is raised again on the game loop.
+
+        :return: Number of generations stepped, 0 while the task is still running
+        """
+        task = self.step_task
+        if task is None or task.is_alive():
+            return 0
+
+        self.step_task = None
+        if task.error is not None:
+            raise task.error
+
+        return task.generations
+
+    def finish_step(self):
+        """Waits for the running step task, before the board is changed or copied outside of it"""
+        if self.step_task is not None:
+            self.step_task.join()
+            self.poll_step_task()
 
     def none_action(self):
         pass
 
+    def rewind(self):
+        if self.stopped_time:
+            self.finish_step()
+            self.board.rewind()
+
+    def step(self):
+        if self.stopped_time:
+            self.finish_step()
+            self.board.update_state()
+
     @staticmethod
     def open_rules():
         webbrowser.open(WindowConfig.RULES_DIR)
 
     def clear_board(self):
+        self.finish_step()
         self.board.reset()
 
     def render(self):
-        self.board.render(self.window, position=(WindowConfig.MENU_WINDOW[0], 0))
-        self.menu.render(self.window, position=(0, 0))
-        pygame.display.update()
+        with self.profiler.phase("render"):
+            # The frames of a generation that is still being stepped keep the last board drawn
+            dirty_rects = []
+            if self.step_task is None:
+                dirty_rects += self.board.render(self.window, position=(WindowConfig.MENU_WINDOW[0], 0))
+            dirty_rects += self.menu.render_changed(self.window, position=(0, 0))
+        with self.profiler.phase("display"):
+            pygame.display.update(dirty_rects)
+
+    def quit(self):
+        # A board that is being written is finished before closing
+        if self.board_task is not None and self.board_task.save:
+            self.board_task.join()
+        if self.metrics_file is not None:
+            self.profiler.dump(self.metrics_file)
+        pygame.quit()
+        sys.exit()
 
     def handle_click(self, x: int, y: int):
         if x < WindowConfig.MENU_WINDOW[0]:
@@ -104,34 +275,57 @@ class Engine(object):
             self.actions[action]()
         else:
             if self.stopped_time:
+                self.finish_step()
                 board_x = x - WindowConfig.MENU_WINDOW[0]
                 self.board.handle_click(board_x, y)
 
     def run_game(self, render: bool = False):
         run = True
         clock = pygame.time.Clock()
-        last_update = time()
+        scheduler = Scheduler(step_budget=BoardConfig.STEP_BUDGET)
+
+        profiler = self.profiler
 
         while run:
             # This will delay the game to given FPS
             clock.tick(BoardConfig.FPS)
 
-            # This will loop through a list of any keyboard or mouse events.
-            for event in pygame.event.get():
-                # Checks if the red button in the corner of the window is clicked
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+            with profiler.phase("events"):
+                # This will loop through a list of any keyboard or mouse events.
+                for event in pygame.event.get():
+                    # Checks if the red button in the corner of the window is clicked
+                    if event.type == pygame.QUIT:
+                        self.quit()
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        self.handle_click(event.pos[0], event.pos[1])
+
+                    if event.type == pygame.KEYDOWN and event.key in self.key_actions:
+                        self.actions[self.key_actions[event.key]]()
 
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    self.handle_click(event.pos[0], event.pos[1])
+                    if event.type == pygame.MOUSEWHEEL:
+                        self.board.zoom_in() if event.y > 0 else self.board.zoom_out()
 
-            if not self.stopped_time:
+            with profiler.phase("step"):
+                generations = self.poll_step_task()
 
-                now = time()
-                if now - last_update >= 1 / self.current_speed:
-                    self.board.update_state()
-                    last_update = now
+            self.poll_board_task()
 
-            self.menu.update()
+            with profiler.phase("menu"):
+                self.menu.refresh()
             self.render() if render else None
+
+            if profiler.enabled:
+                # The board can't be counted while it is being stepped
+                population = self.board.grid.population if self.step_task is None else profiler.population
+                profiler.end_frame(generations, population)
+                self.update_menu_metrics()
+
+            # The next generations are stepped while the game loop waits for the
+            # next frame, and the board is drawn again on the first frame after them
+            with profiler.phase("step"):
+                if self.step_task is None:
+                    if self.stopped_time:
+                        scheduler.reset()
+                    else:
+                        self.start_step(scheduler)
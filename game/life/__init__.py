@@ -0,0 +1,9 @@
+from .rules import Rule, NAMED_RULES, CONWAY
+from .vectorized import count_neighbours, step, step_tile
+from .grid import Coordinates, CellPosition, get_position_neighbours, Grid, PackedGrid, MemmapGrid, create_grid
+from .hashlife import Node, HashLife
+from .unbounded import UnboundedLife
+from .parallel import ParallelStepper
+from .tiled import TiledStepper
+from .history import History
+from .cycles import CycleDetector
@@ -0,0 +1,180 @@
+from typing import Tuple
+
+import numpy as np
+
+from game.configs import Boundaries
+from game.life.rules import Rule, CONWAY
+
+
+WORD_BITS = 64
+
+ONE = np.uint64(1)
+HIGH_SHIFT = np.uint64(WORD_BITS - 1)
+ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def words_per_row(columns: int) -> int:
+    return -(-columns // WORD_BITS)
+
+
+def pack_rows(state: np.ndarray) -> np.ndarray:
+    """Packs a dense state array indexed as state[x, y] into uint64 words, one
+    row of words per board row. Bit i of word j in a row is the cell 64 * j + i.
+
+    :param state: A 2D array with 1 for alive cells and 0 for dead ones
+    :return: A (rows, words per row) uint64 array
+    """
+    columns, rows = state.shape
+    row_bytes = np.packbits(state.T != 0, axis=1, bitorder="little")
+
+    padded = np.zeros((rows, words_per_row(columns) * 8), dtype=np.uint8)
+    padded[:, :row_bytes.shape[1]] = row_bytes
+
+    return padded.view("<u8").astype(np.uint64)
+
+
+def unpack_rows(words: np.ndarray, columns: int) -> np.ndarray:
+    """Inverse of pack_rows, returns a dense uint8 array indexed as state[x, y]"""
+    row_bytes = words.astype("<u8").view(np.uint8)
+    state = np.unpackbits(row_bytes, axis=1, count=columns, bitorder="little")
+
+    return np.ascontiguousarray(state.T)
+
+
+def unpack_window(words: np.ndarray, x: int, columns: int) -> np.ndarray:
+    """Unpacks the columns [x, x + columns) of some packed rows into a dense uint8
+    array indexed as state[x, y], reading only the words that hold them"""
+    first_word = x // WORD_BITS
+    last_word = words_per_row(x + columns)
+    offset = x - first_word * WORD_BITS
+
+    return unpack_rows(words[:, first_word:last_word], offset + columns)[offset:]
+
+
+def population(words: np.ndarray) -> int:
+    return int(np.unpackbits(words.view(np.uint8)).sum(dtype=np.int64))
+
+
+def last_word_mask(columns: int) -> np.uint64:
+    """Mask with the bits of the last word of a row that are inside the board"""
+    remainder = columns % WORD_BITS
+    if remainder == 0:
+        return ALL_BITS
+
+    return np.uint64((1 << remainder) - 1)
+
+
+def count_equals(count_bits: Tuple[np.ndarray, ...], count: int) -> np.ndarray:
+    """Mask of the cells whose neighbour count, given as bit planes from the
+    lowest bit up, is equal to count"""
+    mask = np.full_like(count_bits[0], ALL_BITS)
+    for index, bit in enumerate(count_bits):
+        mask &= bit if (count >> index) & 1 else ~bit
+
+    return mask
+
+
+def apply_rule(words: np.ndarray, count_bits: Tuple[np.ndarray, ...], rule: Rule) -> np.ndarray:
+    """Next generation of any Life-like rule, matching the neighbour count bit
+    planes against every count in the born and survive sets"""
+    born = np.zeros_like(words)
+    for count in rule.born:
+        born |= count_equals(count_bits, count)
+    survive = np.zeros_like(words)
+    for count in rule.survive:
+        survive |= count_equals(count_bits, count)
+
+    return (born & ~words) | (survive & words)
+
+
+def pad_rows(words: np.ndarray, boundary: str) -> np.ndarray:
+    """Adds the rows beyond the top and bottom edges of the board, above and below the words"""
+    if boundary == Boundaries.TORUS.name:
+        above, below = words[-1:], words[:1]
+    elif boundary == Boundaries.MIRROR.name:
+        above, below = words[:1], words[-1:]
+    else:
+        above = below = np.zeros((1, words.shape[1]), dtype=np.uint64)
+
+    return np.concatenate([above, words, below])
+
+
+def edge_bits(words: np.ndarray, columns: int, boundary: str) -> Tuple[np.ndarray, np.ndarray]:
+    """The cells beyond the left and right edges of every row, as the lowest bit of a word"""
+    first = words[:, 0] & ONE
+    last_word, last_bit = divmod(columns - 1, WORD_BITS)
+    last = (words[:, last_word] >> np.uint64(last_bit)) & ONE
+
+    if boundary == Boundaries.TORUS.name:
+        return last, first
+    if boundary == Boundaries.MIRROR.name:
+        return first, last
+
+    return np.zeros_like(first), np.zeros_like(last)
+
+
+def step(words: np.ndarray, columns: int, rule: Rule = CONWAY, boundary: str = Boundaries.DEAD.name) -> np.ndarray:
+    """Computes the next generation of a bit packed board, adding the eight
+    neighbour bit planes with full adder logic so 64 cells are updated by every
+    word operation.
+
+    :param words: A (rows, words per row) uint64 array built with pack_rows
+    :param columns: Number of cells in every row
+    :param rule: The Life-like rule to apply
+    :param boundary: The name of the Boundaries member of the board edges
+    :return: The next generation as a new array of words
+    """
+    return step_rows(pad_rows(words, boundary), columns, rule, boundary)
+
+
+def step_rows(padded: np.ndarray, columns: int, rule: Rule = CONWAY,
+              boundary: str = Boundaries.DEAD.name) -> np.ndarray:
+    """Computes the next generation of bit packed rows that come with the row
+    above and the row below them, so a band of a bigger board can be stepped.
+
+    :param padded: A (rows + 2, words per row) uint64 array, the rows with a one row halo
+    :param columns: Number of cells in every row
+    :param rule: The Life-like rule to apply
+    :param boundary: The name of the Boundaries member of the left and right edges
+    :return: The next generation of the rows without the halo, as a new array of words
+    """
+    words = padded[1:-1]
+    west_edge, east_edge = edge_bits(padded, columns, boundary)
+
+    # Neighbours to the west and east of every cell in the same row, carrying
+    # the edge bits between consecutive words and in from beyond the edges
+    west = padded << ONE
+    west[:, 1:] |= padded[:, :-1] >> HIGH_SHIFT
+    west[:, 0] |= west_edge
+    east = padded >> ONE
+    east[:, :-1] |= padded[:, 1:] << HIGH_SHIFT
+    last_word, last_bit = divmod(columns - 1, WORD_BITS)
+    east[:, last_word] |= east_edge << np.uint64(last_bit)
+
+    # Sum of west, centre and east for every row, used for the rows above and below
+    three_0 = west ^ padded ^ east
+    three_1 = (west & padded) | (east & (west ^ padded))
+    above_0, above_1 = three_0[:-2], three_1[:-2]
+    below_0, below_1 = three_0[2:], three_1[2:]
+
+    # Sum of west and east, used for the row of the cell itself
+    two_0 = west[1:-1] ^ east[1:-1]
+    two_1 = west[1:-1] & east[1:-1]
+
+    # Add the three 2 bit numbers
+    bit_0 = above_0 ^ below_0 ^ two_0
+    carry_0 = (above_0 & below_0) | (two_0 & (above_0 ^ below_0))
+    ones_1 = above_1 ^ below_1 ^ two_1
+    carry_1 = (above_1 & below_1) | (two_1 & (above_1 ^ below_1))
+    bit_1 = ones_1 ^ carry_0
+    bit_2 = carry_1 ^ (ones_1 & carry_0)
+
+    if rule == CONWAY:
+        # The 8s bit is not needed to tell 2 and 3 from the other counts
+        new_words = bit_1 & ~bit_2 & (bit_0 | words)
+    else:
+        bit_3 = carry_1 & ones_1 & carry_0
+        new_words = apply_rule(words, (bit_0, bit_1, bit_2, bit_3), rule)
+    new_words[:, -1] &= last_word_mask(columns)
+
+    return new_words
@@ -0,0 +1,71 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def zobrist_keys(indexes: np.ndarray) -> np.ndarray:
+    """Pseudo random uint64 key of every cell, computed from its flat index with
+    splitmix64 instead of being stored in a table"""
+    keys = np.asarray(indexes).astype(np.uint64) + GOLDEN_GAMMA
+    keys = (keys ^ (keys >> np.uint64(30))) * MIX_1
+    keys = (keys ^ (keys >> np.uint64(27))) * MIX_2
+
+    return keys ^ (keys >> np.uint64(31))
+
+
+def board_hash(state: np.ndarray) -> int:
+    """Zobrist hash of a whole board, the xor of the keys of its alive cells"""
+    return int(np.bitwise_xor.reduce(zobrist_keys(np.flatnonzero(state)), initial=np.uint64(0)))
+
+
+class CycleDetector(object):
+
+    def __init__(self, max_generations: int):
+        """Detects when a board becomes periodic. The Zobrist hash of the board is
+        updated with the keys of the cells born or dead in every generation, and
+        a table from hash to generation finds the first repeated board.
+
+        :param max_generations: Number of recent generations remembered, which is
+            the longest period that can be detected
+        """
+        self.max_generations = max_generations
+        self.hash = 0
+        self.seen: Dict[int, int] = {}
+        self.generation = 0
+
+        self.period: Optional[int] = None
+        self.cycle_start: Optional[int] = None
+
+    def reset(self, state: np.ndarray, generation: int = 0):
+        """Starts detecting from the given board, computing its full hash once"""
+        self.hash = board_hash(state)
+        self.seen = {self.hash: generation}
+        self.generation = generation
+        self.period = None
+        self.cycle_start = None
+
+    def apply(self, changed: np.ndarray) -> Optional[int]:
+        """Adds the next generation.
+
+        :param changed: Flat indexes of the cells born or dead since the last generation
+        :return: The period of the board, or None if it isn't periodic yet
+        """
+        if len(changed):
+            self.hash ^= int(np.bitwise_xor.reduce(zobrist_keys(changed)))
+        self.generation += 1
+
+        first = self.seen.pop(self.hash, None)
+        if first is not None and self.period is None:
+            self.period = self.generation - first
+            self.cycle_start = first
+
+        self.seen[self.hash] = self.generation
+        if len(self.seen) > self.max_generations:
+            del self.seen[next(iter(self.seen))]
+
+        return self.period
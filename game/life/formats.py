@@ -0,0 +1,296 @@
+import re
+import struct
+import warnings
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from game.configs import BoardFormats
+from game.life.rules import Rule
+
+if TYPE_CHECKING:
+    from game.board_io import BoardBuffer
+    from game.life.grid import Grid
+
+
+# The boards read and written, grids and the buffers of the board tasks
+GridLike = Union['Grid', 'BoardBuffer']
+
+FORMAT_EXTENSIONS = {".csv": BoardFormats.CSV.name,
+                     ".rle": BoardFormats.RLE.name,
+                     ".golb": BoardFormats.BINARY.name}
+
+BINARY_MAGIC = b"GOLB"
+BINARY_HEADER = struct.Struct("<4sII")
+
+RLE_LINE_LENGTH = 70
+RLE_TOKEN = re.compile(r"(\d*)([a-zA-Z$!])")
+RLE_RULE = re.compile(r"rule\s*=\s*([^,\s]+)", re.IGNORECASE)
+
+# Number of cells read or written at once, the rest of the board is never in memory
+CHUNK_CELLS = 2 ** 20
+
+
+def chunk_rows(columns: int) -> int:
+    return max(1, CHUNK_CELLS // max(columns, 1))
+
+
+def detect_format(board_file: Path) -> str:
+    """Detects the format of a board file from its extension or, if the extension
+    is unknown, from its first bytes.
+
+    :param board_file: The path of the board file
+    :return: The name of the BoardFormats member
+    """
+    extension = Path(board_file).suffix.lower()
+    if extension in FORMAT_EXTENSIONS:
+        return FORMAT_EXTENSIONS[extension]
+
+    if Path(board_file).exists():
+        with open(board_file, "rb") as f:
+            header = f.read(len(BINARY_MAGIC))
+        if header == BINARY_MAGIC:
+            return BoardFormats.BINARY.name
+        if header[:1] in (b"#", b"x"):
+            return BoardFormats.RLE.name
+
+    return BoardFormats.CSV.name
+
+
+def read_board(grid: GridLike, board_file: Path, board_format: Optional[str] = None):
+    """Loads a board file into the grid, a chunk of rows at a time. Patterns
+    bigger than the grid are clipped to it.
+
+    :param grid: The grid to load the board into, it should be empty
+    :param board_file: The path of the board file
+    :param board_format: The name of the BoardFormats member, detected if not given
+    """
+    board_format = board_format or detect_format(board_file)
+    readers = {BoardFormats.CSV.name: read_csv,
+               BoardFormats.RLE.name: read_rle,
+               BoardFormats.BINARY.name: read_binary}
+
+    readers[board_format](grid, board_file)
+
+
+def write_board(grid: GridLike, board_file: Path, board_format: Optional[str] = None):
+    """Saves the grid to a board file, a chunk of rows at a time.
+
+    :param grid: The grid to save
+    :param board_file: The path of the board file
+    :param board_format: The name of the BoardFormats member, detected if not given
+    """
+    board_format = board_format or detect_format(board_file)
+    writers = {BoardFormats.CSV.name: write_csv,
+               BoardFormats.RLE.name: write_rle,
+               BoardFormats.BINARY.name: write_binary}
+
+    writers[board_format](grid, board_file)
+
+
+def grid_chunks(grid: GridLike) -> Iterator[np.ndarray]:
+    """Iterates over the grid in dense blocks of whole rows, indexed as block[x, y]"""
+    step = chunk_rows(grid.columns)
+    for y in range(0, grid.rows, step):
+        yield grid.window(0, y, grid.columns, step)
+
+
+def csv_block(lines: List[bytes], columns: int, rows: int) -> np.ndarray:
+    """Parses lines of a CSV board into a dense block indexed as block[x, y],
+    splitting all their values at once. A cell is alive when its value is 1."""
+    block = np.zeros((columns, rows), dtype=np.uint8)
+    if not lines:
+        return block
+
+    data = np.frombuffer(b"".join(line.rstrip(b"\r\n") + b"\n" for line in lines), dtype=np.uint8)
+    data = data[data != ord('"')]
+
+    # Every value ends at a comma or at the end of its line
+    ends = np.flatnonzero((data == ord(",")) | (data == ord("\n")))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    alive = (ends - starts == 1) & (data[starts] == ord("1"))
+
+    line_ends = data[ends] == ord("\n")
+    ys = np.concatenate(([0], np.cumsum(line_ends)[:-1]))
+    line_starts = np.concatenate(([0], np.flatnonzero(line_ends)[:-1] + 1))
+    xs = np.arange(len(ends)) - line_starts[ys]
+
+    alive &= xs < columns
+    block[xs[alive], ys[alive]] = 1
+    return block
+
+
+def read_csv(grid: GridLike, board_file: Path):
+    step = chunk_rows(grid.columns)
+    with open(board_file, "rb") as f:
+        for start in range(0, grid.rows, step):
+            rows = min(step, grid.rows - start)
+            grid.set_rows(start, csv_block(list(islice(f, rows)), grid.columns, rows))
+
+
+def csv_lines(block: np.ndarray) -> bytes:
+    """The rows of a dense block as CSV lines, with the line ends of csv.writer"""
+    columns, rows = block.shape
+    text = np.full((rows, 2 * columns + 1), ord(","), dtype=np.uint8)
+    text[:, 0:-1:2] = np.where(block.T != 0, ord("1"), ord("0"))
+    text[:, -2:] = (ord("\r"), ord("\n"))
+
+    return text.tobytes()
+
+
+def write_csv(grid: GridLike, board_file: Path):
+    with open(board_file, "wb") as f:
+        for block in grid_chunks(grid):
+            f.write(csv_lines(block))
+
+
+def rle_runs(f: TextIO) -> Iterator[Tuple[int, int, int]]:
+    """Iterates over the runs of alive cells of an RLE pattern, as (x, y, length)"""
+    x, y = 0, 0
+    for line in f:
+        line = line.strip()
+        if line.startswith("#") or line.startswith("x"):
+            continue
+
+        for count, token in RLE_TOKEN.findall(line):
+            count = int(count) if count else 1
+            if token == "!":
+                return
+            elif token == "$":
+                x, y = 0, y + count
+            elif token == "b":
+                x += count
+            else:
+                # Every state other than dead is alive for a two state rule
+                yield x, y, count
+                x += count
+
+
+def rle_rule(board_file: Path) -> Optional[str]:
+    """The rule in the header line of an RLE pattern, if it has one"""
+    with open(board_file, "r") as f:
+        for line in f:
+            if line.startswith("x"):
+                match = RLE_RULE.search(line)
+                return match.group(1) if match else None
+            if not line.startswith("#"):
+                return None
+
+    return None
+
+
+def check_rle_rule(grid: GridLike, board_file: Path):
+    """Warns when a pattern was written for a different rule than the one of the grid"""
+    notation = rle_rule(board_file)
+    if notation is None:
+        return
+
+    try:
+        rule = Rule.parse(notation)
+    except ValueError:
+        warnings.warn(f"{board_file} uses the rule {notation}, which can't be read, "
+                      f"it will run with {grid.rule.notation}")
+        return
+
+    if rule != grid.rule:
+        warnings.warn(f"{board_file} is a {rule.notation} pattern, it will run with {grid.rule.notation}")
+
+
+def read_rle(grid: GridLike, board_file: Path):
+    check_rle_rule(grid, board_file)
+    step = chunk_rows(grid.columns)
+    start = 0
+    block = np.zeros((grid.columns, min(step, grid.rows)), dtype=np.uint8)
+
+    with open(board_file, "r") as f:
+        for x, y, count in rle_runs(f):
+            if y >= grid.rows:
+                break
+
+            while y >= start + block.shape[1]:
+                grid.set_rows(start, block)
+                start += block.shape[1]
+                block = np.zeros((grid.columns, min(step, grid.rows - start)), dtype=np.uint8)
+
+            block[x:x + count, y - start] = 1
+
+    grid.set_rows(start, block)
+
+
+def rle_count(count: int) -> str:
+    return str(count) if count > 1 else ""
+
+
+class RleWriter(object):
+
+    def __init__(self, f: TextIO):
+        """Writes RLE tokens wrapping the lines at the standard length"""
+        self.f = f
+        self.line: List[str] = []
+        self.line_length = 0
+
+    def write(self, token: str):
+        if self.line_length + len(token) > RLE_LINE_LENGTH:
+            self.f.write("".join(self.line) + "\n")
+            self.line, self.line_length = [], 0
+
+        self.line.append(token)
+        self.line_length += len(token)
+
+    def close(self):
+        self.f.write("".join(self.line) + "\n")
+
+
+def write_rle(grid: GridLike, board_file: Path):
+    with open(board_file, "w") as f:
+        f.write(f"x = {grid.columns}, y = {grid.rows}, rule = {grid.rule.notation}\n")
+        writer = RleWriter(f)
+
+        pending_rows = 0
+        for block in grid_chunks(grid):
+            for row in block.T:
+                edges = np.flatnonzero(np.diff(np.concatenate(([0], row, [0])).astype(np.int8)))
+                if len(edges) == 0:
+                    pending_rows += 1
+                    continue
+
+                if pending_rows:
+                    writer.write(f"{rle_count(pending_rows)}$")
+                end = 0
+                for run_start, run_end in zip(edges[::2], edges[1::2]):
+                    if run_start > end:
+                        writer.write(f"{rle_count(run_start - end)}b")
+                    writer.write(f"{rle_count(run_end - run_start)}o")
+                    end = run_end
+                pending_rows = 1
+
+        writer.write("!")
+        writer.close()
+
+
+def read_binary(grid: GridLike, board_file: Path):
+    with open(board_file, "rb") as f:
+        magic, columns, rows = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{board_file} is not a binary board file")
+
+        row_bytes = -(-columns // 8)
+        step = chunk_rows(columns)
+        for start in range(0, min(rows, grid.rows), step):
+            count = min(step, rows - start, grid.rows - start)
+            data = np.frombuffer(f.read(count * row_bytes), dtype=np.uint8).reshape(count, row_bytes)
+            cells = np.unpackbits(data, axis=1, count=columns, bitorder="little").T
+
+            block = np.zeros((grid.columns, count), dtype=np.uint8)
+            block[:min(columns, grid.columns)] = cells[:grid.columns]
+            grid.set_rows(start, block)
+
+
+def write_binary(grid: GridLike, board_file: Path):
+    with open(board_file, "wb") as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, grid.columns, grid.rows))
+
+        for block in grid_chunks(grid):
+            f.write(np.packbits(block.T != 0, axis=1, bitorder="little").tobytes())
@@ -0,0 +1,614 @@
+from typing import Tuple, Set, Optional, NamedTuple
+from pathlib import Path
+
+import numpy as np
+
+from game.configs import StepEngines, Boundaries, BoardConfig
+from game.life import vectorized, bitpacked, formats
+from game.life.unbounded import UnboundedLife
+from game.life.hashlife import HashLife
+from game.life.parallel import ParallelStepper
+from game.life.tiled import TiledStepper
+from game.life.history import History
+from game.life.cycles import CycleDetector
+from game.life.rules import Rule, CONWAY
+
+
+# A cell position in a board, in units, as an (x, y) tuple
+Coordinates = Tuple[int, int]
+
+# Offsets from a cell to its eight neighbours
+NEIGHBOUR_OFFSETS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                              if dx != 0 or dy != 0], dtype=np.intp)
+
+
+class CellPosition(NamedTuple):
+    """Stores a cell position in a board, in units. It is a plain (x, y) tuple,
+    so it hashes and compares like the Coordinates tuples the board API works with."""
+    x: int
+    y: int
+
+    def __repr__(self):
+        return f"CellPosition( x = {self.x}, y = {self.y} )"
+
+    def as_tuple(self) -> Coordinates:
+        return self.x, self.y
+
+
+def get_position_neighbours(position: Coordinates) -> Set[CellPosition]:
+    x, y = position
+    return {CellPosition(x + dx, y + dy) for dx, dy in NEIGHBOUR_OFFSETS.tolist()}
+
+
+# Engines that only look at the neighbourhood of alive cells
+SPARSE_ENGINES = (StepEngines.CELLS.name, StepEngines.UNBOUNDED.name, StepEngines.HASHLIFE.name)
+# Engines that step the board as a window over an unbounded plane, so it has no edges
+PLANE_ENGINES = (StepEngines.UNBOUNDED.name, StepEngines.HASHLIFE.name)
+
+
+class Grid(object):
+
+    def __init__(self, columns: int, rows: int, engine: str = StepEngines.CELLS.name, rule: Rule = CONWAY,
+                 boundary: str = Boundaries.DEAD.name):
+        """Headless Game of Life board. The live state is a dense uint8 array
+        indexed as state[x, y], with 1 for alive cells and 0 for dead ones.
+
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param engine: The name of the StepEngines member used to advance the board
+        :param rule: The Life-like rule the engine applies
+        :param boundary: The name of the Boundaries member of the board edges
+        """
+        if engine in SPARSE_ENGINES and rule.births_from_nothing:
+            raise ValueError(f"The {engine} engine can't run {rule.notation}, cells without "
+                             f"alive neighbours would be born")
+        if engine in PLANE_ENGINES and boundary != Boundaries.DEAD.name:
+            raise ValueError(f"The {engine} engine has no edges, it can't use the {boundary} boundary")
+
+        self.columns = columns
+        self.rows = rows
+        self.engine = engine
+        self.rule = rule
+        self.boundary = boundary
+
+        self.allocate()
+        self.plane: Optional[UnboundedLife] = None
+        self.hashlife: Optional[HashLife] = None
+        # The board as Hashlife last left it, any other board was edited or replaced
+        self.hashlife_window: Optional[np.ndarray] = None
+        self.stepper: Optional[ParallelStepper] = None
+        self.tiles: Optional[TiledStepper] = None
+        self.history: Optional[History] = None
+        self.cycles: Optional[CycleDetector] = None
+        # The last generation the history and the cycle detection saw, every new
+        # generation is diffed against it once for both of them
+        self.tracked: Optional[np.ndarray] = None
+
+    def allocate(self):
+        """Creates the storage of an empty board"""
+        self.state: np.ndarray = np.zeros((self.columns, self.rows), dtype=np.uint8)
+
+    @property
+    def engines(self):
+        return {StepEngines.CELLS.name: self.update_state_cells,
+                StepEngines.VECTORIZED.name: self.update_state_vectorized,
+                StepEngines.UNBOUNDED.name: self.update_state_unbounded,
+                StepEngines.PARALLEL.name: self.update_state_parallel,
+                StepEngines.TILED.name: self.update_state_tiled,
+                StepEngines.HASHLIFE.name: self.update_state_hashlife}
+
+    @property
+    def active_cells(self) -> Set[CellPosition]:
+        return set(map(CellPosition._make, self.alive_cells().tolist()))
+
+    def alive_cells(self) -> np.ndarray:
+        """The positions of the alive cells as an (n, 2) array of x, y pairs"""
+        return np.argwhere(self.state)
+
+    @property
+    def population(self) -> int:
+        return int(np.count_nonzero(self.state))
+
+    def reset(self):
+        self.state.fill(0)
+        self.plane = None
+        self.hashlife = None
+        if self.tiles is not None:
+            self.tiles.touch_all()
+        self.board_replaced()
+
+    def window(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        """A dense uint8 array with a rectangle of the board, indexed as state[x, y]"""
+        return self.state[x:x + columns, y:y + rows]
+
+    def is_alive(self, x: int, y: int) -> bool:
+        return bool(self.state[x, y])
+
+    def change_state(self, x: int, y: int):
+        self.state[x, y] = 1 - self.state[x, y]
+        if self.tiles is not None:
+            self.tiles.touch(x, y)
+        self.board_edited()
+
+    @staticmethod
+    def get_alive_neighbours(positions: np.ndarray, padded: np.ndarray) -> np.ndarray:
+        """Alive neighbours of many cells, read from the state padded with the cells beyond the edges.
+
+        :param positions: An (n, 2) array of x, y pairs of cells of the board
+        :param padded: The state with a one cell halo around it
+        :return: An array with the alive neighbours of every position
+        """
+        xs, ys = positions[:, 0] + 1, positions[:, 1] + 1
+        neighbours = np.zeros(len(positions), dtype=np.uint8)
+        for dx, dy in NEIGHBOUR_OFFSETS.tolist():
+            neighbours += padded[xs + dx, ys + dy]
+
+        return neighbours
+
+    def valid_position(self, position: Coordinates) -> bool:
+        x, y = position
+        return 0 <= x < self.columns and 0 <= y < self.rows
+
+    def valid_positions(self, positions: np.ndarray) -> np.ndarray:
+        """A boolean mask of the positions of an (n, 2) array that are inside the board"""
+        xs, ys = positions[:, 0], positions[:, 1]
+        return (xs >= 0) & (xs < self.columns) & (ys >= 0) & (ys < self.rows)
+
+    def boundary_positions(self, positions: np.ndarray) -> np.ndarray:
+        """The cells of the board some neighbour positions refer to, leaving out the
+        ones outside the board. Mirrored positions are left out too, they are always
+        a cell that is already next to the position they were taken from.
+
+        :param positions: An (n, 2) array of x, y pairs
+        :return: An (m, 2) array with the positions inside the board
+        """
+        if self.boundary == Boundaries.TORUS.name:
+            return positions % (self.columns, self.rows)
+
+        return positions[self.valid_positions(positions)]
+
+    def update_state(self):
+        """Advances the board one generation using the selected engine"""
+        self.engines[self.engine]()
+        if self.tracked is None:
+            return
+
+        state = self.state
+        changed = np.flatnonzero(state.ravel() != self.tracked.ravel())
+        self.tracked.ravel()[changed] = state.ravel()[changed]
+
+        if self.history is not None:
+            self.history.record(state, changed, self.beyond_board())
+        if self.cycles is not None:
+            self.cycles.apply(changed)
+
+    def advance(self, generations: int):
+        """Advances the board a number of generations. Hashlife jumps over all of
+        them at once when no generation has to be recorded, the other engines
+        step them one at a time."""
+        if self.engine == StepEngines.HASHLIFE.name and self.history is None and self.cycles is None:
+            self.update_state_hashlife(generations)
+            return
+
+        for _ in range(generations):
+            self.update_state()
+
+    def enable_history(self, max_bytes: int, keyframe_interval: int):
+        """Starts recording every generation so the board can be rewound.
+
+        :param max_bytes: Memory budget of the history
+        :param keyframe_interval: Maximum number of generations stored as deltas between full keyframes
+        """
+        self.history = History(max_bytes, keyframe_interval)
+        self.history.record(self.state, beyond_board=self.beyond_board())
+        self.track()
+
+    def enable_cycle_detection(self, max_generations: int):
+        """Starts tracking the board hash, so cycles.period tells when the board
+        became periodic.
+
+        :param max_generations: The longest period that can be detected
+        """
+        self.cycles = CycleDetector(max_generations)
+        self.cycles.reset(self.state)
+        self.track()
+
+    def track(self):
+        """Copies the board the next generation is diffed against, when anything is recorded"""
+        if self.history is not None or self.cycles is not None:
+            self.tracked = self.state.copy()
+
+    def board_replaced(self):
+        """Starts the history and the cycle detection over from a board that was
+        loaded, replaced or cleared, since it doesn't follow from the generations before it"""
+        if self.history is not None:
+            self.history.clear()
+            self.history.record(self.state)
+        if self.cycles is not None:
+            self.cycles.reset(self.state)
+        self.track()
+
+    def board_edited(self):
+        """Makes the edited board the current generation of the history, so
+        stepping and rewinding goes back to the board as it was edited. The cycle
+        detection starts over from it, the boards seen before may not come back."""
+        if self.history is not None and self.history.frames:
+            self.history.amend(self.state)
+        if self.cycles is not None:
+            self.cycles.reset(self.state, self.cycles.generation)
+        self.track()
+
+    def rewind(self, generations: int = 1):
+        """Goes back to a previous generation, if it is still in the history"""
+        if self.history is None or not self.history.frames:
+            return
+
+        # The unbounded plane goes back with the board, the Hashlife plane starts
+        # over from the board and the tiles follow the generation rewound from
+        generation = self.history.generation
+        self.state = self.history.rewind(generations)
+        self.plane = None
+        if self.history.beyond_board is not None:
+            self.plane = UnboundedLife.from_keys(self.history.beyond_board, rule=self.rule)
+        self.hashlife = None
+        if self.tiles is not None:
+            self.tiles.touch_all()
+
+        # The boards after the one rewound to were seen, but will not necessarily come back
+        if self.cycles is not None:
+            self.cycles.reset(self.state, self.cycles.generation - (generation - self.history.generation))
+        self.track()
+
+    def update_state_cells(self):
+        """Steps only the active cells and their neighbours. The candidate cells are
+        kept as arrays of coordinates, deduplicated as packed x * rows + y ints."""
+        padded = np.pad(self.state, 1, mode=vectorized.PAD_MODES[self.boundary])
+
+        alive_cells = self.alive_cells()
+        neighbours = (alive_cells[:, None, :] + NEIGHBOUR_OFFSETS[None, :, :]).reshape(-1, 2)
+        candidates = np.concatenate((alive_cells, self.boundary_positions(neighbours)))
+
+        packed = np.unique(candidates[:, 0] * self.rows + candidates[:, 1])
+        candidates = np.stack(np.divmod(packed, self.rows), axis=1)
+
+        xs, ys = candidates[:, 0], candidates[:, 1]
+        alive_neighbours = self.get_alive_neighbours(candidates, padded)
+
+        new_state = np.zeros_like(self.state)
+        new_state[xs, ys] = self.rule.table[self.state[xs, ys], alive_neighbours]
+
+        self.state = new_state
+
+    def beyond_board(self) -> Optional[np.ndarray]:
+        """The packed keys of the alive cells of the unbounded plane that are beyond the board"""
+        if self.plane is None:
+            return None
+
+        return self.plane.keys_outside(0, 0, self.columns, self.rows)
+
+    def update_state_vectorized(self):
+        """Steps the whole board at once over the dense state array"""
+        self.state = vectorized.step(self.state, self.rule, self.boundary)
+
+    def update_state_unbounded(self):
+        """Steps the board as a window over an unbounded plane, so patterns keep
+        evolving after they leave the board and can come back into it"""
+        if self.plane is None:
+            self.plane = UnboundedLife(rule=self.rule)
+
+        # The board may have been edited since the last generation
+        self.plane.paste(self.state)
+        self.plane.step()
+        self.state = self.plane.to_array(0, 0, self.columns, self.rows)
+
+    def update_state_hashlife(self, generations: int = 1):
+        """Advances the board as a window over an unbounded plane with Hashlife,
+        any number of generations in a single call. The plane is kept between
+        calls, so patterns that leave the board can come back into it. An
+        edited board starts a new plane with only the cells on the board."""
+        if self.hashlife is None or not np.array_equal(self.state, self.hashlife_window):
+            self.hashlife = HashLife.from_array(self.state, rule=self.rule)
+
+        self.hashlife.step(generations)
+        self.state = self.hashlife.to_array(0, 0, self.columns, self.rows)
+        self.hashlife_window = self.state.copy()
+
+    def update_state_parallel(self):
+        """Steps the board in stripes on a pool of worker processes. The state
+        is kept as a view of the shared buffer between generations."""
+        if self.stepper is None:
+            self.stepper = ParallelStepper(self.columns, self.rows, rule=self.rule,
+                                           boundary=self.boundary)
+
+        # The board may have been replaced since the last generation
+        if not np.shares_memory(self.state, self.stepper.state):
+            self.stepper.load(self.state)
+
+        self.stepper.step()
+        self.state = self.stepper.state
+
+    def update_state_tiled(self):
+        """Steps the board in place, one tile at a time, skipping the tiles
+        around which nothing changed in the last generation"""
+        if self.tiles is None:
+            self.tiles = TiledStepper(self.columns, self.rows, BoardConfig.TILE_SIDE, self.rule, self.boundary)
+
+        self.tiles.step(self.state)
+
+    def close(self):
+        """Releases the worker processes and shared memory of the parallel engine"""
+        if self.stepper is not None:
+            self.state = self.state.copy()
+            self.stepper.close()
+            self.stepper = None
+
+    def set_rows(self, y: int, block: np.ndarray):
+        """Replaces whole rows of the board, starting at row y, with a dense block
+        indexed as block[x, y]"""
+        self.state[:, y:y + block.shape[1]] = block
+        if self.tiles is not None:
+            self.tiles.touch_all()
+
+    def replace_state(self, state: np.ndarray):
+        """Swaps a whole generation in at once, such as a board read in the background
+
+        :param state: A dense uint8 array indexed as state[x, y], with the size of the board
+        """
+        self.plane = None
+        self.hashlife = None
+        self.state = state
+        if self.tiles is not None:
+            self.tiles.touch_all()
+        self.board_replaced()
+
+    def load_board(self, board_file: Path):
+        """Loads a CSV, RLE or binary board file, detecting its format"""
+        self.reset()
+        formats.read_board(self, board_file)
+        self.board_replaced()
+
+    def save_board(self, board_file: Path):
+        """Saves the board in the format given by the file extension, CSV by default"""
+        formats.write_board(self, board_file)
+
+
+class PackedGrid(Grid):
+
+    def __init__(self, columns: int, rows: int, engine: str = StepEngines.BITPACKED.name, rule: Rule = CONWAY,
+                 boundary: str = Boundaries.DEAD.name):
+        """Grid that stores every row packed in uint64 words, one bit per cell, and
+        steps them with the bitwise kernel. The state property packs and unpacks
+        the dense array, so loading and saving work the same as in Grid.
+
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param engine: Only StepEngines.BITPACKED is supported
+        :param rule: The Life-like rule the engine applies
+        :param boundary: The name of the Boundaries member of the board edges
+        """
+        super().__init__(columns, rows, engine, rule, boundary)
+
+    def allocate(self):
+        self.words: np.ndarray = np.zeros((self.rows, bitpacked.words_per_row(self.columns)), dtype=np.uint64)
+
+    @property
+    def engines(self):
+        return {StepEngines.BITPACKED.name: self.update_state_bitpacked}
+
+    @property
+    def state(self) -> np.ndarray:
+        return bitpacked.unpack_rows(self.words, self.columns)
+
+    @state.setter
+    def state(self, state: np.ndarray):
+        self.words = bitpacked.pack_rows(state)
+
+    @property
+    def population(self) -> int:
+        return bitpacked.population(self.words)
+
+    def reset(self):
+        self.words.fill(0)
+        self.board_replaced()
+
+    def window(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        columns = min(columns, self.columns - x)
+        return bitpacked.unpack_window(self.words[y:y + rows], x, columns)
+
+    def set_rows(self, y: int, block: np.ndarray):
+        self.words[y:y + block.shape[1]] = bitpacked.pack_rows(block)
+
+    def is_alive(self, x: int, y: int) -> bool:
+        word, bit = divmod(x, bitpacked.WORD_BITS)
+        return bool((int(self.words[y, word]) >> bit) & 1)
+
+    def change_state(self, x: int, y: int):
+        word, bit = divmod(x, bitpacked.WORD_BITS)
+        self.words[y, word] ^= np.uint64(1 << bit)
+        self.board_edited()
+
+    def update_state_bitpacked(self):
+        self.words = bitpacked.step(self.words, self.columns, self.rule, self.boundary)
+
+
+class MemmapGrid(Grid):
+
+    MAGIC = int.from_bytes(b"GOLMEMAP", "little")
+    HEADER_WORDS = 8
+    GENERATION = 3
+    SLOT = 4
+    # Peak memory of stepping a band, which sets the default number of rows per band
+    BAND_BYTES = 32 * 2 ** 20
+    # The source band with its halo and the temporaries of bitpacked.step_rows,
+    # in multiples of the packed size of the band, measured with tracemalloc
+    STEP_TEMPORARIES = 20
+
+    def __init__(self, path: Path, columns: int, rows: int, engine: str = StepEngines.MEMMAP.name,
+                 band_rows: Optional[int] = None, rule: Rule = CONWAY, boundary: str = Boundaries.DEAD.name):
+        """Grid whose state lives in a memory mapped file of bit packed rows, so
+        boards larger than the memory can be stepped. The file holds two
+        generation slots and the header points to the current one. A generation
+        is stepped in bands of rows into the other slot, and the header is only
+        switched once the whole slot was written, so the file always holds a
+        consistent generation. Only one band is mapped at a time.
+
+        :param path: The file of the grid, it is created if it doesn't exist
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param engine: Only StepEngines.MEMMAP is supported
+        :param band_rows: Rows stepped at once, by default as many as keep the peak
+            memory of stepping a band around BAND_BYTES
+        :param rule: The Life-like rule the engine applies
+        :param boundary: The name of the Boundaries member of the board edges
+        """
+        self.path = Path(path)
+        self.words_per_row = bitpacked.words_per_row(columns)
+        # The source of every band also holds a halo row above and below it
+        budget_rows = self.BAND_BYTES // (self.STEP_TEMPORARIES * 8 * self.words_per_row)
+        self.band_rows = band_rows or max(1, budget_rows - 2)
+        super().__init__(columns, rows, engine, rule, boundary)
+
+    @classmethod
+    def open(cls, path: Path, band_rows: Optional[int] = None, rule: Rule = CONWAY,
+             boundary: str = Boundaries.DEAD.name) -> 'MemmapGrid':
+        """Opens an existing grid file with the size stored in its header"""
+        header = np.fromfile(path, dtype=np.uint64, count=cls.HEADER_WORDS)
+        return cls(path, int(header[1]), int(header[2]), band_rows=band_rows, rule=rule, boundary=boundary)
+
+    def allocate(self):
+        if self.path.exists():
+            header = self.header()
+            if tuple(header[:3]) != (self.MAGIC, self.columns, self.rows):
+                raise ValueError(f"{self.path} is not a grid file of {self.columns}x{self.rows} cells")
+            self.slot = int(header[self.SLOT])
+            return
+
+        slot_bytes = self.rows * self.words_per_row * 8
+        with open(self.path, "wb") as f:
+            f.truncate(self.HEADER_WORDS * 8 + 2 * slot_bytes)
+
+        header = self.header()
+        header[:3] = (self.MAGIC, self.columns, self.rows)
+        header.flush()
+        self.slot = 0
+
+    def header(self) -> np.memmap:
+        return np.memmap(self.path, dtype=np.uint64, mode="r+", shape=(self.HEADER_WORDS,))
+
+    def rows_map(self, slot: int, y: int, count: int) -> np.memmap:
+        """Maps the packed rows [y, y + count) of a generation slot"""
+        offset = (self.HEADER_WORDS + (slot * self.rows + y) * self.words_per_row) * 8
+        return np.memmap(self.path, dtype=np.uint64, mode="r+", offset=offset,
+                         shape=(count, self.words_per_row))
+
+    def bands(self):
+        """Iterates over the bands of rows as (first row, number of rows)"""
+        for y in range(0, self.rows, self.band_rows):
+            yield y, min(self.band_rows, self.rows - y)
+
+    @property
+    def engines(self):
+        return {StepEngines.MEMMAP.name: self.update_state_memmap}
+
+    @property
+    def generation(self) -> int:
+        return int(self.header()[self.GENERATION])
+
+    @property
+    def state(self) -> np.ndarray:
+        return self.window(0, 0, self.columns, self.rows)
+
+    @state.setter
+    def state(self, state: np.ndarray):
+        self.set_rows(0, state)
+
+    @property
+    def population(self) -> int:
+        return sum(bitpacked.population(np.array(self.rows_map(self.slot, y, count)))
+                   for y, count in self.bands())
+
+    def reset(self):
+        for y, count in self.bands():
+            band = self.rows_map(self.slot, y, count)
+            band.fill(0)
+            band.flush()
+        self.board_replaced()
+
+    def window(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        columns = min(columns, self.columns - x)
+        rows = min(rows, self.rows - y)
+        if columns <= 0 or rows <= 0:
+            return np.zeros((max(columns, 0), max(rows, 0)), dtype=np.uint8)
+
+        return bitpacked.unpack_window(self.rows_map(self.slot, y, rows), x, columns)
+
+    def set_rows(self, y: int, block: np.ndarray):
+        if block.shape[1] == 0:
+            return
+
+        band = self.rows_map(self.slot, y, block.shape[1])
+        band[:] = bitpacked.pack_rows(block)
+        band.flush()
+
+    def is_alive(self, x: int, y: int) -> bool:
+        word, bit = divmod(x, bitpacked.WORD_BITS)
+        return bool((int(self.rows_map(self.slot, y, 1)[0, word]) >> bit) & 1)
+
+    def change_state(self, x: int, y: int):
+        word, bit = divmod(x, bitpacked.WORD_BITS)
+        row = self.rows_map(self.slot, y, 1)
+        row[0, word] ^= np.uint64(1 << bit)
+        row.flush()
+        self.board_edited()
+
+    def halo_row(self, y: int) -> np.ndarray:
+        """The packed row y of the current generation, which can be beyond the
+        top or bottom edge, as a (1, words per row) array"""
+        if self.boundary == Boundaries.TORUS.name:
+            y %= self.rows
+        elif self.boundary == Boundaries.MIRROR.name:
+            y = min(max(y, 0), self.rows - 1)
+        elif not 0 <= y < self.rows:
+            return np.zeros((1, self.words_per_row), dtype=np.uint64)
+
+        return np.array(self.rows_map(self.slot, y, 1))
+
+    def update_state_memmap(self):
+        """Steps the grid one band at a time, reading a one row halo above and
+        below every band, into the slot that doesn't hold the current generation"""
+        following = 1 - self.slot
+        for y, count in self.bands():
+            source = np.concatenate([self.halo_row(y - 1),
+                                     self.rows_map(self.slot, y, count),
+                                     self.halo_row(y + count)])
+
+            band = self.rows_map(following, y, count)
+            band[:] = bitpacked.step_rows(source, self.columns, self.rule, self.boundary)
+            band.flush()
+
+        header = self.header()
+        header[self.GENERATION] += 1
+        header[self.SLOT] = following
+        header.flush()
+        self.slot = following
+
+
+def create_grid(columns: int, rows: int, engine: str, path: Optional[Path] = None, rule: Rule = CONWAY,
+                boundary: str = Boundaries.DEAD.name) -> Grid:
+    """Creates a grid with the storage the engine needs.
+
+    :param columns: Number of cells in the horizontal axis
+    :param rows: Number of cells in the vertical axis
+    :param engine: The name of the StepEngines member used to advance the board
+    :param path: The file of the grid, only used by StepEngines.MEMMAP
+    :param rule: The Life-like rule the engine applies
+    :param boundary: The name of the Boundaries member of the board edges
+    """
+    if engine == StepEngines.BITPACKED.name:
+        return PackedGrid(columns, rows, engine, rule, boundary)
+    if engine == StepEngines.MEMMAP.name:
+        if path is None:
+            raise ValueError("The MEMMAP engine needs a grid file")
+        return MemmapGrid(path, columns, rows, engine, rule=rule, boundary=boundary)
+
+    return Grid(columns, rows, engine, rule, boundary)
@@ -0,0 +1,328 @@
+from typing import Dict, Tuple, Optional, Iterator, List
+
+import numpy as np
+
+from game.life.rules import Rule, CONWAY
+
+
+class Node(object):
+    """A canonical quadtree node. Nodes are never mutated and equal subtrees
+    are always the same object, so nodes hash and compare by identity."""
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level: int, nw: Optional['Node'], ne: Optional['Node'],
+                 sw: Optional['Node'], se: Optional['Node'], population: int):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+    def __repr__(self):
+        return f"Node( level = {self.level}, population = {self.population} )"
+
+
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+# Bit of every cell of a 3x3 neighbourhood, flattened as neighbourhood[dx, dy]
+NEIGHBOURHOOD_BITS = 1 << np.arange(9)
+
+
+class HashLife(object):
+
+    def __init__(self, max_nodes: int = 1_000_000, rule: Rule = CONWAY):
+        """Memoized quadtree (Hashlife) engine over an unbounded plane. Advances
+        a pattern 2^k generations in a single call, reusing the result of every
+        sub-pattern already seen.
+
+        :param max_nodes: When the node cache grows past this size it is reduced
+            to the nodes reachable from the current pattern
+        :param rule: The Life-like rule to apply, it can't give birth to cells without alive neighbours
+        """
+        if rule.births_from_nothing:
+            raise ValueError(f"Hashlife can't run {rule.notation}, empty nodes would not stay empty")
+        self.rule = rule
+        self.max_nodes = max_nodes
+        self.nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self.results: Dict[Tuple[Node, int], Node] = {}
+        self.empties: List[Node] = [OFF]
+
+        self.root: Node = self.empty(3)
+        self.origin: Tuple[int, int] = (0, 0)
+        self.generation = 0
+
+    @classmethod
+    def from_array(cls, state: np.ndarray, origin: Tuple[int, int] = (0, 0),
+                   max_nodes: int = 1_000_000, rule: Rule = CONWAY) -> 'HashLife':
+        """Builds the engine from a dense state array indexed as state[x, y].
+
+        :param state: A 2D array with 1 for alive cells and 0 for dead ones
+        :param origin: Plane coordinates of state[0, 0]
+        :param max_nodes: See HashLife
+        :param rule: See HashLife
+        """
+        life = cls(max_nodes, rule)
+
+        level = 3
+        while 2 ** level < max(state.shape):
+            level += 1
+
+        padded = np.zeros((2 ** level, 2 ** level), dtype=np.uint8)
+        padded[:state.shape[0], :state.shape[1]] = state != 0
+
+        life.root = life.build(padded, 0, 0, level)
+        life.origin = origin
+        return life
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Returns the canonical node with the given quadrants"""
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self.nodes[key] = node
+
+        return node
+
+    def empty(self, level: int) -> Node:
+        while len(self.empties) <= level:
+            last = self.empties[-1]
+            self.empties.append(self.join(last, last, last, last))
+
+        return self.empties[level]
+
+    def build(self, state: np.ndarray, x: int, y: int, level: int) -> Node:
+        """Builds the node of the given level whose top left corner is state[x, y]"""
+        if level == 0:
+            return ON if state[x, y] else OFF
+
+        side = 2 ** level
+        if not state[x:x + side, y:y + side].any():
+            return self.empty(level)
+
+        half = side // 2
+        return self.join(self.build(state, x, y, level - 1),
+                         self.build(state, x + half, y, level - 1),
+                         self.build(state, x, y + half, level - 1),
+                         self.build(state, x + half, y + half, level - 1))
+
+    def centre(self, node: Node) -> Node:
+        """Returns a node one level up with the given node in its centre"""
+        border = self.empty(node.level - 1)
+        return self.join(self.join(border, border, border, node.nw),
+                         self.join(border, border, node.ne, border),
+                         self.join(border, node.sw, border, border),
+                         self.join(node.se, border, border, border))
+
+    def inner(self, node: Node) -> Node:
+        """Returns the centre of the node, one level down"""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def is_padded(self, node: Node) -> bool:
+        """Whether all the alive cells of the node are in its centre"""
+        return node.level >= 3 and self.inner(node).population == node.population
+
+    def life_4x4(self, node: Node) -> Tuple[Node, Node, Node, Node]:
+        """Advances the centre 2x2 cells of a level 2 node one generation, looking
+        up every 3x3 neighbourhood in the rule table"""
+        cells = [[quadrant.nw, quadrant.ne, quadrant.sw, quadrant.se]
+                 for quadrant in (node.nw, node.ne, node.sw, node.se)]
+        grid = np.zeros((4, 4), dtype=np.uint8)
+        for (qx, qy), quadrant in zip(((0, 0), (2, 0), (0, 2), (2, 2)), cells):
+            for (cx, cy), cell in zip(((0, 0), (1, 0), (0, 1), (1, 1)), quadrant):
+                grid[qx + cx, qy + cy] = cell.population
+
+        result = []
+        for x, y in ((1, 1), (2, 1), (1, 2), (2, 2)):
+            neighbourhood = int(grid[x - 1:x + 2, y - 1:y + 2].ravel() @ NEIGHBOURHOOD_BITS)
+            result.append(ON if self.rule.neighbourhood_table[neighbourhood] else OFF)
+
+        return result[0], result[1], result[2], result[3]
+
+    def successor(self, node: Node, j: int) -> Node:
+        """Returns the centre of the node, one level down, advanced 2^j generations.
+        A node can advance at most 2^(level - 2) generations, bigger values of j
+        are clamped to that."""
+        if node.population == 0:
+            return node.nw
+
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self.join(*self.life_4x4(node))
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c1 = self.successor(self.join(nw.nw, nw.ne, nw.sw, nw.se), j)
+            c2 = self.successor(self.join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self.successor(self.join(ne.nw, ne.ne, ne.sw, ne.se), j)
+            c4 = self.successor(self.join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self.successor(self.join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self.successor(self.join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self.successor(self.join(sw.nw, sw.ne, sw.sw, sw.se), j)
+            c8 = self.successor(self.join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self.successor(self.join(se.nw, se.ne, se.sw, se.se), j)
+
+            if j < node.level - 2:
+                # The nine sub-results are already 2^j generations ahead, so the
+                # second half only has to stitch their centres together
+                result = self.join(self.join(c1.se, c2.sw, c4.ne, c5.nw),
+                                   self.join(c2.se, c3.sw, c5.ne, c6.nw),
+                                   self.join(c4.se, c5.sw, c7.ne, c8.nw),
+                                   self.join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                result = self.join(self.successor(self.join(c1, c2, c4, c5), j),
+                                   self.successor(self.join(c2, c3, c5, c6), j),
+                                   self.successor(self.join(c4, c5, c7, c8), j),
+                                   self.successor(self.join(c5, c6, c8, c9), j))
+
+        self.results[key] = result
+        return result
+
+    def step_pow2(self, k: int):
+        """Advances the pattern 2^k generations in one call.
+
+        :param k: The exponent of the number of generations to advance
+        """
+        root = self.root
+        x, y = self.origin
+        while root.level < k + 2 or not self.is_padded(root):
+            x, y = x - 2 ** (root.level - 1), y - 2 ** (root.level - 1)
+            root = self.centre(root)
+
+        x, y = x - 2 ** (root.level - 1), y - 2 ** (root.level - 1)
+        root = self.centre(root)
+
+        self.root = self.successor(root, k)
+        self.origin = (x + 2 ** (root.level - 2), y + 2 ** (root.level - 2))
+        self.generation += 2 ** k
+
+        if len(self.nodes) > self.max_nodes:
+            self.collect()
+
+    def step(self, generations: int = 1):
+        """Advances the pattern any number of generations, one power of two at a time"""
+        k = 0
+        while generations > 0:
+            if generations & 1:
+                self.step_pow2(k)
+            generations >>= 1
+            k += 1
+
+    def collect(self):
+        """Drops every cached result and every node not reachable from the
+        current pattern, keeping the nodes canonical"""
+        self.results = {}
+        self.nodes = {}
+
+        reachable = set()
+        pending = [self.root] + self.empties[1:]
+        while pending:
+            node = pending.pop()
+            if node.level == 0 or node in reachable:
+                continue
+            reachable.add(node)
+            self.nodes[(node.nw, node.ne, node.sw, node.se)] = node
+            pending.extend((node.nw, node.ne, node.sw, node.se))
+
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """The inclusive bounds (min_x, min_y, max_x, max_y) of the alive cells
+        in plane coordinates, or None if the pattern is empty"""
+        if self.root.population == 0:
+            return None
+
+        memo: Dict[Tuple[Node, str], int] = {}
+
+        def lowest(node: Node, axis: str) -> int:
+            if node.level == 0:
+                return 0
+            key = (node, axis)
+            if key not in memo:
+                half = 2 ** (node.level - 1)
+                if axis == "x":
+                    first, second = (node.nw, node.sw), (node.ne, node.se)
+                else:
+                    first, second = (node.nw, node.ne), (node.sw, node.se)
+
+                if first[0].population or first[1].population:
+                    memo[key] = min(lowest(child, axis) for child in first if child.population)
+                else:
+                    memo[key] = half + min(lowest(child, axis) for child in second if child.population)
+
+            return memo[key]
+
+        def highest(node: Node, axis: str) -> int:
+            if node.level == 0:
+                return 0
+            key = (node, axis + "+")
+            if key not in memo:
+                half = 2 ** (node.level - 1)
+                if axis == "x":
+                    first, second = (node.ne, node.se), (node.nw, node.sw)
+                else:
+                    first, second = (node.sw, node.se), (node.nw, node.ne)
+
+                if first[0].population or first[1].population:
+                    memo[key] = half + max(highest(child, axis) for child in first if child.population)
+                else:
+                    memo[key] = max(highest(child, axis) for child in second if child.population)
+
+            return memo[key]
+
+        x, y = self.origin
+        return (x + lowest(self.root, "x"), y + lowest(self.root, "y"),
+                x + highest(self.root, "x"), y + highest(self.root, "y"))
+
+    def cells(self) -> Iterator[Tuple[int, int]]:
+        """Yields the plane coordinates of every alive cell"""
+        pending = [(self.root, self.origin[0], self.origin[1])]
+        while pending:
+            node, x, y = pending.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield x, y
+                continue
+
+            half = 2 ** (node.level - 1)
+            pending.extend(((node.nw, x, y), (node.ne, x + half, y),
+                            (node.sw, x, y + half), (node.se, x + half, y + half)))
+
+    def to_array(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        """Materializes a window of the plane as a dense uint8 array indexed as state[x, y]
+
+        :param x: Plane coordinate of the left column of the window
+        :param y: Plane coordinate of the top row of the window
+        :param columns: Width of the window in cells
+        :param rows: Height of the window in cells
+        """
+        state = np.zeros((columns, rows), dtype=np.uint8)
+
+        pending = [(self.root, self.origin[0], self.origin[1])]
+        while pending:
+            node, node_x, node_y = pending.pop()
+            side = 2 ** node.level
+            outside = (node_x >= x + columns or node_y >= y + rows or
+                       node_x + side <= x or node_y + side <= y)
+            if node.population == 0 or outside:
+                continue
+            if node.level == 0:
+                state[node_x - x, node_y - y] = 1
+                continue
+
+            half = side // 2
+            pending.extend(((node.nw, node_x, node_y), (node.ne, node_x + half, node_y),
+                            (node.sw, node_x, node_y + half), (node.se, node_x + half, node_y + half)))
+
+        return state
@@ -0,0 +1,162 @@
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+
+# A frame is (is keyframe, data, beyond board), data being packed bits for
+# keyframes and the flat indexes of the cells that changed for deltas
+Frame = Tuple[bool, np.ndarray, Optional[np.ndarray]]
+
+
+def frame_bytes(frame: Frame) -> int:
+    _, data, beyond_board = frame
+    return data.nbytes + (beyond_board.nbytes if beyond_board is not None else 0)
+
+
+class History(object):
+
+    def __init__(self, max_bytes: int, keyframe_interval: int):
+        """Bounded history of the generations of a grid. Every generation is
+        stored as the packed positions of the cells that were born or died since
+        the previous one, with a full keyframe of packed bits every
+        keyframe_interval generations, or sooner when the deltas of a keyframe
+        would go over the memory budget. When the history goes over its budget
+        the oldest keyframe and its deltas are dropped, but never the newest
+        keyframe, so the last generation can always be rewound to.
+
+        :param max_bytes: Memory budget for the stored frames
+        :param keyframe_interval: Maximum number of deltas between keyframes
+        """
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+
+        self.frames: List[Frame] = []
+        self.first_generation = 0
+        self.size_bytes = 0
+
+        # Shape of the recorded boards
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.since_keyframe = 0
+        # Size of the newest keyframe and the frames after it
+        self.group_bytes = 0
+
+    @property
+    def generation(self) -> int:
+        """The generation of the last recorded state"""
+        return self.first_generation + len(self.frames) - 1
+
+    @property
+    def beyond_board(self) -> Optional[np.ndarray]:
+        """The cells beyond the board recorded with the last generation"""
+        return self.frames[-1][2] if self.frames else None
+
+    def record(self, state: np.ndarray, changed: Optional[np.ndarray] = None,
+               beyond_board: Optional[np.ndarray] = None):
+        """Stores a new generation, as a delta against the last one when it is smaller
+        than a keyframe, the keyframe interval hasn't been reached and the frames
+        since the last keyframe still fit in the budget
+
+        :param state: The board of the new generation
+        :param changed: Flat indexes of the cells that changed since the last recorded
+            generation, or None if the board doesn't follow from it
+        :param beyond_board: Packed keys of the alive cells of an unbounded plane that are
+            beyond the board, stored as they are with the generation
+        """
+        if self.shape != state.shape:
+            if self.frames:
+                self.clear(self.generation + 1)
+            self.shape = state.shape
+
+        if changed is not None and self.frames:
+            changed = changed.astype(np.uint32 if state.size < 2 ** 32 else np.uint64)
+        else:
+            changed = None
+
+        keyframe_bytes = -(-state.size // 8)
+        if (changed is None or self.since_keyframe + 1 >= self.keyframe_interval
+                or changed.nbytes >= keyframe_bytes
+                or self.group_bytes + frame_bytes((False, changed, beyond_board)) > self.max_bytes):
+            frame = (True, np.packbits(state.ravel() != 0), beyond_board)
+            self.since_keyframe = 0
+            self.group_bytes = 0
+        else:
+            frame = (False, changed, beyond_board)
+            self.since_keyframe += 1
+
+        self.frames.append(frame)
+        self.size_bytes += frame_bytes(frame)
+        self.group_bytes += frame_bytes(frame)
+        self.evict()
+
+    def amend(self, state: np.ndarray):
+        """Replaces the last generation with an edited board. It is stored as a
+        keyframe, so no delta has to be rebuilt for the edits. The edits are on
+        the board, so the cells beyond it stay as they were."""
+        last = self.frames.pop()
+        self.size_bytes -= frame_bytes(last)
+
+        frame = (True, np.packbits(state.ravel() != 0), last[2])
+        self.frames.append(frame)
+        self.size_bytes += frame_bytes(frame)
+        self.since_keyframe = 0
+        self.group_bytes = frame_bytes(frame)
+        self.evict()
+
+    def clear(self, first_generation: int = 0):
+        self.frames = []
+        self.first_generation = first_generation
+        self.size_bytes = 0
+        self.group_bytes = 0
+
+    def evict(self):
+        """Drops the oldest frames until the history fits in its budget. Deltas
+        are only dropped together with the keyframe they depend on, and the
+        newest keyframe is kept even if it doesn't fit on its own."""
+        while self.size_bytes > self.max_bytes:
+            next_keyframe = next((index for index, frame in enumerate(self.frames)
+                                  if frame[0] and index > 0), None)
+            if next_keyframe is None:
+                break
+            for _ in range(next_keyframe):
+                self.drop_first()
+
+    def drop_first(self):
+        self.size_bytes -= frame_bytes(self.frames.pop(0))
+        self.first_generation += 1
+
+    def state_at(self, generation: int) -> np.ndarray:
+        """Rebuilds a recorded generation from the closest keyframe before it"""
+        index = generation - self.first_generation
+        if not 0 <= index < len(self.frames):
+            raise IndexError(f"Generation {generation} is not in the history")
+
+        keyframe = index
+        while not self.frames[keyframe][0]:
+            keyframe -= 1
+
+        cells = np.unpackbits(self.frames[keyframe][1], count=int(np.prod(self.shape)))
+        for _, changed, _ in self.frames[keyframe + 1:index + 1]:
+            cells[changed] ^= 1
+
+        return cells.reshape(self.shape)
+
+    def rewind(self, generations: int = 1) -> np.ndarray:
+        """Goes back some generations, forgetting the ones after it.
+
+        :param generations: Number of generations to go back, limited to the oldest one stored
+        :return: The state of the generation it went back to
+        """
+        generation = max(self.generation - generations, self.first_generation)
+        state = self.state_at(generation)
+
+        for frame in self.frames[generation - self.first_generation + 1:]:
+            self.size_bytes -= frame_bytes(frame)
+        del self.frames[generation - self.first_generation + 1:]
+
+        keyframe = generation - self.first_generation
+        while not self.frames[keyframe][0]:
+            keyframe -= 1
+        self.since_keyframe = generation - self.first_generation - keyframe
+        self.group_bytes = sum(frame_bytes(frame) for frame in self.frames[keyframe:])
+
+        return state
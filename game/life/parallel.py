@@ -0,0 +1,102 @@
+import os
+import weakref
+from contextlib import suppress
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Tuple, List, Optional, Dict
+
+import numpy as np
+
+from game.configs import Boundaries
+from game.life import vectorized
+from game.life.rules import Rule, CONWAY
+
+
+# Views of the shared buffers inside every worker process, set by attach_buffers
+worker_buffers: Dict[int, np.ndarray] = {}
+worker_memory: List[SharedMemory] = []
+
+
+def attach_buffers(names: List[str], shape: Tuple[int, int]):
+    """Pool initializer, maps the shared generation buffers into the worker"""
+    for index, name in enumerate(names):
+        memory = SharedMemory(name=name)
+        worker_memory.append(memory)
+        worker_buffers[index] = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+
+
+def step_stripe(source: int, start: int, stop: int, rule: Rule, boundary: str):
+    """Steps the columns [start, stop) of the source buffer into the other buffer.
+    The halo columns of the neighbour stripes are read straight from shared memory."""
+    current = worker_buffers[source]
+    following = worker_buffers[1 - source]
+    following[start:stop] = vectorized.step_tile(current, start, 0, stop - start, current.shape[1], rule, boundary)
+
+
+def release(pool: Pool, memory: List[SharedMemory]):
+    pool.terminate()
+    pool.join()
+    for block in memory:
+        block.unlink()
+        # Arrays still viewing the buffer keep it mapped until they are collected
+        with suppress(BufferError):
+            block.close()
+
+
+class ParallelStepper(object):
+
+    def __init__(self, columns: int, rows: int, processes: Optional[int] = None, rule: Rule = CONWAY,
+                 boundary: str = Boundaries.DEAD.name):
+        """Steps a dense grid on a pool of processes. The grid lives in two shared
+        memory buffers, the current generation and the next one, and every worker
+        steps a stripe of columns reading its one cell halo from the current buffer.
+        Generations are computed in lockstep, so results match vectorized.step.
+
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param processes: Number of worker processes, defaults to the number of CPUs
+        :param rule: The Life-like rule to apply
+        :param boundary: The name of the Boundaries member of the grid edges
+        """
+        self.shape = (columns, rows)
+        self.rule = rule
+        self.boundary = boundary
+        self.memory = [SharedMemory(create=True, size=max(columns * rows, 1)) for _ in range(2)]
+        self.buffers = [np.ndarray(self.shape, dtype=np.uint8, buffer=block.buf)
+                        for block in self.memory]
+        self.current = 0
+
+        self.processes = processes or os.cpu_count() or 1
+        self.pool = Pool(self.processes, initializer=attach_buffers,
+                         initargs=([block.name for block in self.memory], self.shape))
+        self.stripes = self.split_stripes(columns, self.processes)
+        self.finalizer = weakref.finalize(self, release, self.pool, self.memory)
+
+    @staticmethod
+    def split_stripes(columns: int, stripes: int) -> List[Tuple[int, int]]:
+        bounds = np.linspace(0, columns, min(stripes, columns) + 1).astype(int)
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    @property
+    def state(self) -> np.ndarray:
+        """The current generation, as a view of the shared buffer"""
+        return self.buffers[self.current]
+
+    def load(self, state: np.ndarray):
+        self.buffers[self.current][:] = state
+
+    def step(self, generations: int = 1):
+        for _ in range(generations):
+            self.pool.starmap(step_stripe, [(self.current, start, stop, self.rule, self.boundary)
+                                            for start, stop in self.stripes])
+            self.current = 1 - self.current
+
+    def close(self):
+        self.buffers = []
+        self.finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
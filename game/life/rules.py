@@ -0,0 +1,80 @@
+import re
+from typing import FrozenSet
+
+import numpy as np
+
+
+RULE_PATTERN = re.compile(r"^B([0-8]*)/?S([0-8]*)$", re.IGNORECASE)
+
+# Well known Life-like rules that can be given by name instead of in B/S notation
+NAMED_RULES = {"LIFE": "B3/S23",
+               "HIGHLIFE": "B36/S23",
+               "SEEDS": "B2/S",
+               "DAY_AND_NIGHT": "B3678/S34678",
+               "LIFE_WITHOUT_DEATH": "B3/S012345678",
+               "MAZE": "B3/S12345"}
+
+
+class Rule(object):
+
+    def __init__(self, born: FrozenSet[int], survive: FrozenSet[int]):
+        """A Life-like rule, compiled into lookup tables so engines apply it as a
+        single gather instead of comparing neighbour counts cell by cell.
+
+        :param born: Neighbour counts that make a dead cell alive
+        :param survive: Neighbour counts that keep an alive cell alive
+        """
+        self.born = frozenset(born)
+        self.survive = frozenset(survive)
+
+        # The next state of a cell indexed as table[state, neighbours]
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, sorted(self.born)] = 1
+        self.table[1, sorted(self.survive)] = 1
+
+        # The next state of the centre of a 3x3 neighbourhood, indexed by its
+        # cells as bits, with bit 3 * dx + dy for the cell at (dx, dy)
+        neighbourhoods = np.arange(512)
+        cells = (neighbourhoods[:, None] >> np.arange(9)[None, :]) & 1
+        centre = cells[:, 4]
+        neighbours = cells.sum(axis=1) - centre
+        self.neighbourhood_table = self.table[centre, neighbours]
+
+    @classmethod
+    def parse(cls, rule: str) -> 'Rule':
+        """Builds a rule from B/S notation, such as B36/S23, or from one of NAMED_RULES"""
+        notation = NAMED_RULES.get(rule.upper(), rule).replace(" ", "")
+        match = RULE_PATTERN.match(notation)
+        if match is None:
+            raise ValueError(f"{rule} is not a rule in B/S notation")
+
+        born, survive = match.groups()
+        return cls(frozenset(int(count) for count in born), frozenset(int(count) for count in survive))
+
+    @property
+    def births_from_nothing(self) -> bool:
+        """Whether dead cells without alive neighbours are born. Sparse engines
+        only look at the neighbourhood of alive cells, so they can't run these rules."""
+        return 0 in self.born
+
+    def apply(self, state: np.ndarray, neighbours: np.ndarray) -> np.ndarray:
+        """The next state of every cell given its state and its number of alive neighbours"""
+        return self.table[state, neighbours]
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.born == other.born and self.survive == other.survive
+
+    def __hash__(self):
+        return hash((self.born, self.survive))
+
+    @property
+    def notation(self) -> str:
+        born = "".join(str(count) for count in sorted(self.born))
+        survive = "".join(str(count) for count in sorted(self.survive))
+        return f"B{born}/S{survive}"
+
+    def __repr__(self):
+        return f"Rule( {self.notation} )"
+
+
+CONWAY = Rule.parse("B3/S23")
@@ -0,0 +1,120 @@
+from typing import List, Tuple, Optional
+
+import numpy as np
+
+from game.configs import Boundaries
+from game.life import vectorized
+from game.life.rules import Rule, CONWAY
+
+
+# Above this fraction of active tiles, stepping the whole board at once is
+# faster than paying the per tile overhead
+DENSE_FRACTION = 1 / 8
+
+
+class TiledStepper(object):
+
+    def __init__(self, columns: int, rows: int, tile_side: int, rule: Rule = CONWAY,
+                 boundary: str = Boundaries.DEAD.name):
+        """Steps a dense grid in square tiles, skipping the tiles that can't change.
+        A tile is only stepped if it or one of the eight tiles around it changed in
+        the last generation, so the cost of a generation follows the activity of
+        the board instead of its area or population.
+
+        :param columns: Number of cells in the horizontal axis
+        :param rows: Number of cells in the vertical axis
+        :param tile_side: Side of every tile in cells
+        :param rule: The Life-like rule to apply
+        :param boundary: The name of the Boundaries member of the grid edges
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_side = tile_side
+        self.rule = rule
+        self.boundary = boundary
+
+        tiles_shape = (-(-columns // tile_side), -(-rows // tile_side))
+        self.active: np.ndarray = np.ones(tiles_shape, dtype=bool)
+        # The array stepped last generation, any other array is a new board
+        self.stepped: Optional[np.ndarray] = None
+
+    @property
+    def active_tiles(self) -> int:
+        return int(np.count_nonzero(self.active))
+
+    def touch(self, x: int, y: int):
+        """Marks the tiles around a cell that was edited, so they are stepped next generation"""
+        tile_x, tile_y = x // self.tile_side, y // self.tile_side
+        self.active |= self.spread(self.single_tile(tile_x, tile_y))
+
+    def touch_all(self):
+        """Marks every tile, after the whole board was replaced"""
+        self.active.fill(True)
+
+    def single_tile(self, tile_x: int, tile_y: int) -> np.ndarray:
+        tiles = np.zeros_like(self.active)
+        tiles[tile_x, tile_y] = True
+        return tiles
+
+    def spread(self, changed: np.ndarray) -> np.ndarray:
+        """The changed tiles together with the tiles around them, which wrap
+        around the edges on a torus"""
+        padded = np.pad(changed, 1, mode=vectorized.PAD_MODES[self.boundary])
+        width, height = changed.shape
+
+        spread = np.zeros_like(changed)
+        for dx in (0, 1, 2):
+            for dy in (0, 1, 2):
+                spread |= padded[dx:dx + width, dy:dy + height]
+
+        return spread
+
+    def step(self, state: np.ndarray):
+        """Advances the grid one generation in place. Every active tile is stepped
+        reading the current generation, and the tiles that changed are written
+        back once all of them were computed. When more than DENSE_FRACTION of the
+        tiles are active the grid is stepped as a whole instead.
+
+        :param state: A 2D uint8 array with 1 for alive cells and 0 for dead ones
+        """
+        if state is not self.stepped:
+            self.touch_all()
+            self.stepped = state
+
+        if self.active_tiles > DENSE_FRACTION * self.active.size:
+            self.step_dense(state)
+        else:
+            self.step_sparse(state)
+
+    def step_dense(self, state: np.ndarray):
+        """Steps the whole grid at once and finds the tiles that changed"""
+        new_state = vectorized.step(state, self.rule, self.boundary)
+
+        tiles_x, tiles_y = self.active.shape
+        side = self.tile_side
+        difference = np.zeros((tiles_x * side, tiles_y * side), dtype=bool)
+        difference[:self.columns, :self.rows] = new_state != state
+        changed = difference.reshape(tiles_x, side, tiles_y, side).any(axis=(1, 3))
+
+        state[:] = new_state
+        self.active = self.spread(changed)
+
+    def step_sparse(self, state: np.ndarray):
+        """Steps only the active tiles, reading their halo from the current generation"""
+        changes: List[Tuple[int, int, np.ndarray]] = []
+        changed = np.zeros_like(self.active)
+
+        side = self.tile_side
+        for tile_x, tile_y in np.argwhere(self.active):
+            x, y = tile_x * side, tile_y * side
+            columns, rows = min(side, self.columns - x), min(side, self.rows - y)
+
+            new_tile = vectorized.step_tile(state, x, y, columns, rows, self.rule, self.boundary)
+            if not np.array_equal(new_tile, state[x:x + columns, y:y + rows]):
+                changes.append((x, y, new_tile))
+                changed[tile_x, tile_y] = True
+
+        for x, y, new_tile in changes:
+            state[x:x + new_tile.shape[0], y:y + new_tile.shape[1]] = new_tile
+
+        self.active = self.spread(changed)
@@ -0,0 +1,152 @@
+from typing import Iterable, Tuple, Iterator, Optional
+
+import numpy as np
+
+from game.life.rules import Rule, CONWAY
+
+
+# Coordinates are stored with this offset so they fit in an unsigned 32 bit half
+COORDINATE_OFFSET = 2 ** 31
+
+NEIGHBOUR_OFFSETS = np.array([(dx << 32) + dy
+                              for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                              if dx != 0 or dy != 0], dtype=np.int64).astype(np.uint64)
+
+
+def pack(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Packs plane coordinates into uint64 keys, x in the high half and y in the low half.
+    Coordinates must be in [-2^31, 2^31)."""
+    xs = np.asarray(xs, dtype=np.int64) + COORDINATE_OFFSET
+    ys = np.asarray(ys, dtype=np.int64) + COORDINATE_OFFSET
+
+    return (xs.astype(np.uint64) << np.uint64(32)) | ys.astype(np.uint64)
+
+
+def unpack(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverse of pack, returns the x and y coordinates as int64 arrays"""
+    xs = (keys >> np.uint64(32)).astype(np.int64) - COORDINATE_OFFSET
+    ys = (keys & np.uint64(0xFFFFFFFF)).astype(np.int64) - COORDINATE_OFFSET
+
+    return xs, ys
+
+
+class UnboundedLife(object):
+
+    def __init__(self, cells: Iterable[Tuple[int, int]] = (), rule: Rule = CONWAY):
+        """Sparse engine over an unbounded plane. The alive cells are a sorted
+        array of packed uint64 keys, so the cost of a generation depends on the
+        population and not on the area the pattern covers.
+
+        :param cells: Plane coordinates of the initial alive cells
+        :param rule: The Life-like rule to apply, it can't give birth to cells without alive neighbours
+        """
+        if rule.births_from_nothing:
+            raise ValueError(f"The unbounded engine can't run {rule.notation}, it fills the whole plane")
+        self.rule = rule
+
+        cells = np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+        self.keys: np.ndarray = np.unique(pack(cells[:, 0], cells[:, 1]))
+        self.generation = 0
+
+    @classmethod
+    def from_array(cls, state: np.ndarray, origin: Tuple[int, int] = (0, 0),
+                   rule: Rule = CONWAY) -> 'UnboundedLife':
+        """Builds the engine from a dense state array indexed as state[x, y].
+
+        :param state: A 2D array with 1 for alive cells and 0 for dead ones
+        :param origin: Plane coordinates of state[0, 0]
+        :param rule: See UnboundedLife
+        """
+        life = cls(rule=rule)
+        life.paste(state, *origin)
+        return life
+
+    @classmethod
+    def from_keys(cls, keys: np.ndarray, rule: Rule = CONWAY) -> 'UnboundedLife':
+        """Builds the engine from sorted packed keys, such as the ones of keys_outside
+
+        :param keys: Sorted uint64 keys of the alive cells, see pack
+        :param rule: See UnboundedLife
+        """
+        life = cls(rule=rule)
+        life.keys = keys
+        return life
+
+    @property
+    def population(self) -> int:
+        return len(self.keys)
+
+    def step(self, generations: int = 1):
+        """Advances the pattern counting the neighbours of every alive cell in a
+        single unique pass over the packed keys. The alive cells are counted once
+        more as their own candidates, so they are looked up even without neighbours."""
+        for _ in range(generations):
+            neighbours = (self.keys[:, None] + NEIGHBOUR_OFFSETS[None, :]).ravel()
+            candidates, counts = np.unique(np.concatenate([neighbours, self.keys]), return_counts=True)
+
+            alive = self.contains(candidates)
+            counts -= alive
+            self.keys = candidates[self.rule.apply(alive.view(np.uint8), counts) == 1]
+            self.generation += 1
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """Whether each of the given packed keys is alive"""
+        indexes = np.searchsorted(self.keys, keys)
+        found = indexes < len(self.keys)
+        found[found] = self.keys[indexes[found]] == keys[found]
+
+        return found
+
+    def paste(self, state: np.ndarray, x: int = 0, y: int = 0):
+        """Replaces a window of the plane with a dense state array
+
+        :param state: A 2D array with 1 for alive cells and 0 for dead ones
+        :param x: Plane coordinate of the left column of the window
+        :param y: Plane coordinate of the top row of the window
+        """
+        alive_x, alive_y = np.nonzero(state)
+        pasted = pack(alive_x + x, alive_y + y)
+        self.keys = np.union1d(self.keys_outside(x, y, *state.shape), pasted)
+
+    def keys_outside(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        """The sorted packed keys of the alive cells outside a window of the plane
+
+        :param x: Plane coordinate of the left column of the window
+        :param y: Plane coordinate of the top row of the window
+        :param columns: Width of the window in cells
+        :param rows: Height of the window in cells
+        """
+        xs, ys = unpack(self.keys)
+        outside = (xs < x) | (xs >= x + columns) | (ys < y) | (ys >= y + rows)
+
+        return self.keys[outside]
+
+    def cells(self) -> Iterator[Tuple[int, int]]:
+        """Iterates over the plane coordinates of every alive cell"""
+        xs, ys = unpack(self.keys)
+        return zip(xs.tolist(), ys.tolist())
+
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """The inclusive bounds (min_x, min_y, max_x, max_y) of the alive cells,
+        or None if the pattern is empty"""
+        if len(self.keys) == 0:
+            return None
+
+        xs, ys = unpack(self.keys)
+        return int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())
+
+    def to_array(self, x: int, y: int, columns: int, rows: int) -> np.ndarray:
+        """Materializes a window of the plane as a dense uint8 array indexed as state[x, y]
+
+        :param x: Plane coordinate of the left column of the window
+        :param y: Plane coordinate of the top row of the window
+        :param columns: Width of the window in cells
+        :param rows: Height of the window in cells
+        """
+        state = np.zeros((columns, rows), dtype=np.uint8)
+
+        xs, ys = unpack(self.keys)
+        inside = (xs >= x) & (xs < x + columns) & (ys >= y) & (ys < y + rows)
+        state[xs[inside] - x, ys[inside] - y] = 1
+
+        return state
@@ -0,0 +1,97 @@
+import numpy as np
+
+from game.configs import Boundaries
+from game.life.rules import Rule, CONWAY
+
+
+# np.pad modes that fill the one cell halo around the grid for every boundary
+PAD_MODES = {Boundaries.DEAD.name: "constant",
+             Boundaries.TORUS.name: "wrap",
+             Boundaries.MIRROR.name: "symmetric"}
+
+
+def count_padded_neighbours(padded: np.ndarray) -> np.ndarray:
+    """Counts the alive neighbours of every cell of a grid that already has a
+    one cell halo around it.
+
+    :param padded: A 2D uint8 array with the grid surrounded by its halo
+    :return: A uint8 array with the shape of the grid without the halo
+    """
+    width, height = padded.shape[0] - 2, padded.shape[1] - 2
+
+    neighbours = np.zeros((width, height), dtype=np.uint8)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            if dx == 1 and dy == 1:
+                continue
+            neighbours += padded[dx:dx + width, dy:dy + height]
+
+    return neighbours
+
+
+def count_neighbours(state: np.ndarray, boundary: str = Boundaries.DEAD.name) -> np.ndarray:
+    """Counts the alive neighbours of every cell in the grid at once. The cells
+    outside the grid are dead, wrap around to the other side or mirror the
+    cells on the edge, depending on the boundary.
+
+    :param state: A 2D uint8 array with 1 for alive cells and 0 for dead ones
+    :param boundary: The name of the Boundaries member of the grid edges
+    :return: A uint8 array with the same shape as state
+    """
+    return count_padded_neighbours(np.pad(state, 1, mode=PAD_MODES[boundary]))
+
+
+def step(state: np.ndarray, rule: Rule = CONWAY, boundary: str = Boundaries.DEAD.name) -> np.ndarray:
+    """Computes the next generation of the whole grid, looking up the next state
+    of every cell in the rule table at once.
+
+    :param state: A 2D uint8 array with 1 for alive cells and 0 for dead ones
+    :param rule: The Life-like rule to apply
+    :param boundary: The name of the Boundaries member of the grid edges
+    :return: The next generation as a new uint8 array
+    """
+    return rule.apply(state, count_neighbours(state, boundary))
+
+
+def halo_indexes(start: int, count: int, size: int, boundary: str) -> np.ndarray:
+    """Indexes of the cells [start - 1, start + count + 1) along an axis of the
+    grid, mapped back into the grid. With dead edges the indexes outside the
+    grid are kept as they are."""
+    indexes = np.arange(start - 1, start + count + 1)
+    if boundary == Boundaries.TORUS.name:
+        return indexes % size
+    if boundary == Boundaries.MIRROR.name:
+        indexes = np.where(indexes < 0, -indexes - 1, indexes)
+        return np.where(indexes >= size, 2 * size - indexes - 1, indexes)
+
+    return indexes
+
+
+def step_tile(state: np.ndarray, x: int, y: int, columns: int, rows: int, rule: Rule = CONWAY,
+              boundary: str = Boundaries.DEAD.name) -> np.ndarray:
+    """Computes the next generation of a rectangle of the grid, reading a one cell
+    halo around it from the grid itself. The result is the same as slicing the
+    result of step over the whole grid.
+
+    :param state: A 2D uint8 array with 1 for alive cells and 0 for dead ones
+    :param x: Left column of the tile
+    :param y: Top row of the tile
+    :param columns: Width of the tile in cells
+    :param rows: Height of the tile in cells
+    :param rule: The Life-like rule to apply
+    :param boundary: The name of the Boundaries member of the grid edges
+    :return: The next generation of the tile as a new uint8 array
+    """
+    if boundary == Boundaries.DEAD.name:
+        left, top = max(x - 1, 0), max(y - 1, 0)
+        right, bottom = min(x + columns + 1, state.shape[0]), min(y + rows + 1, state.shape[1])
+
+        new_block = step(state[left:right, top:bottom], rule)
+
+        return new_block[x - left:x - left + columns, y - top:y - top + rows]
+
+    xs = halo_indexes(x, columns, state.shape[0], boundary)
+    ys = halo_indexes(y, rows, state.shape[1], boundary)
+    padded = state[np.ix_(xs, ys)]
+
+    return rule.apply(padded[1:-1, 1:-1], count_padded_neighbours(padded))
@@ -1,3 +1,3 @@
-from .menu_utils import LineSeparator, SpeedDisplay, SpeedTitle, GameEntity
+from .menu_utils import LineSeparator, SpeedDisplay, SpeedTitle, GameEntity, MetricsDisplay
 from .buttons import HelpButton, TextButton, PlayButton, SpeedButton
 from .menu import Menu
@@ -48,6 +48,10 @@ class PlayButton(Button):
         self.stopped_mode = not self.stopped_mode
         return Actions.CHANGE_STATE.name
 
+    @property
+    def state(self) -> bool:
+        return self.stopped_mode
+
     def update(self):
 
         self.generate_border()
@@ -1,8 +1,10 @@
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 
-from game.configs import Actions, Colors
+import pygame
+
+from game.configs import Actions, Colors, MenuLayout
 from game.menu import GameEntity, PlayButton, TextButton, HelpButton
-from game.menu import LineSeparator, SpeedDisplay, SpeedTitle, SpeedButton
+from game.menu import LineSeparator, SpeedDisplay, SpeedTitle, SpeedButton, MetricsDisplay
 
 
 class MenuManager:
@@ -59,7 +61,7 @@ class MenuManager:
 
 class Menu(GameEntity):
 
-    def __init__(self, size: Tuple[int, int], current_speed: int):
+    def __init__(self, size: Tuple[int, int], current_speed: int, show_metrics: bool = False):
 
         self.menu_manager = MenuManager(size)
         self.current_speed = current_speed
@@ -105,6 +107,11 @@ class Menu(GameEntity):
         max_button_pos = (width_spaces * 2 + increase_button.width, speed_full_controls_height)
         self.menu_manager.add_free_entity(max_button, max_button_pos)
 
+        if show_metrics:
+            metrics_display = MetricsDisplay()
+            metrics_display_pos = ((width - metrics_display.width) // 2, MenuLayout.METRICS_POSITION)
+            self.menu_manager.add_free_entity(metrics_display, metrics_display_pos)
+
         help_button = HelpButton()
         help_button_pos = ((width - help_button.width) // 2, 530)
         self.menu_manager.add_free_entity(help_button, help_button_pos)
@@ -112,12 +119,42 @@ class Menu(GameEntity):
         super().__init__(size)
 
     def update(self):
+        """Draws the whole menu with the current surfaces of the entities"""
         self.surface.fill(Colors.BLACK)
 
         for position, entity in self.menu_manager.entities.items():
-            entity.update()
             entity.render(self.surface, position)
-    
+
+        self.dirty_rects = [self.rect]
+
+    def refresh(self) -> bool:
+        """Redraws only the entities whose state changed since the last refresh.
+
+        :return: Whether anything in the menu changed
+        """
+        for position, entity in self.menu_manager.entities.items():
+            if entity.refresh():
+                entity.render(self.surface, position)
+                rect = entity.rect.move(position)
+                if rect not in self.dirty_rects:
+                    self.dirty_rects.append(rect)
+
+        return bool(self.dirty_rects)
+
+    def render_changed(self, surface: pygame.Surface, position: Tuple[int, int]) -> List[pygame.Rect]:
+        """Blits the regions of the menu that changed since the last call.
+
+        :param surface: The surface to draw the menu on
+        :param position: Where the menu is placed in the surface
+        :return: The rectangles of the surface that changed
+        """
+        dirty_rects = [rect.move(position) for rect in self.dirty_rects]
+        for rect, dirty_rect in zip(self.dirty_rects, dirty_rects):
+            surface.blit(self.surface, dirty_rect, area=rect)
+
+        self.dirty_rects = []
+        return dirty_rects
+
     def click(self):
         pass
 
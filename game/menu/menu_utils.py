@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Tuple, Hashable
 from abc import abstractmethod, ABCMeta
 
 import pygame
@@ -12,6 +12,7 @@ class GameEntity(metaclass=ABCMeta):
         self.size = size
         self.surface = pygame.Surface(self.size)
         self.update()
+        self.rendered_state = self.state
 
     @property
     def width(self) -> int:
@@ -25,6 +26,24 @@ class GameEntity(metaclass=ABCMeta):
     def rect(self) -> pygame.Rect:
         return self.surface.get_rect()
 
+    @property
+    def state(self) -> Hashable:
+        """What the surface shows. Entities whose content never changes keep the default."""
+        return None
+
+    def refresh(self) -> bool:
+        """Updates the surface only if the state changed since the last update.
+
+        :return: Whether the surface was updated
+        """
+        state = self.state
+        if state == self.rendered_state:
+            return False
+
+        self.update()
+        self.rendered_state = state
+        return True
+
     def render(self, surface: pygame.Surface, position: Tuple[int, int]):
         surface.blit(self.surface, position)
 
@@ -73,6 +92,10 @@ class SpeedDisplay(GameEntity):
         self.font = pygame.font.Font(MenuLayout.SPEED_DISPLAY_FONT, MenuLayout.SPEED_DISPLAY_SIZE[1])
         super().__init__(MenuLayout.SPEED_DISPLAY_SIZE)
 
+    @property
+    def state(self) -> int:
+        return self.current_speed
+
     def update(self):
         self.surface.fill(MenuLayout.BACKGROUND_COLOR)
         text_surface = self.font.render(str(self.current_speed), True, MenuLayout.MAIN_COLOR)
@@ -82,3 +105,38 @@ class SpeedDisplay(GameEntity):
 
     def click(self) -> str:
         return Actions.NONE.name
+
+
+class MetricsDisplay(GameEntity):
+
+    def __init__(self):
+        """Overlay with the profiling metrics of the last frames"""
+        self.metrics = {}
+        self.font = pygame.font.Font(MenuLayout.FONT_FILE, MenuLayout.METRICS_FONT_SIZE)
+        super().__init__(MenuLayout.METRICS_DISPLAY_SIZE)
+
+    @property
+    def state(self) -> Tuple[str, ...]:
+        return tuple(self.lines)
+
+    @property
+    def lines(self):
+        if not self.metrics:
+            return []
+
+        lines = [f"fps {self.metrics['fps']:.0f}",
+                 f"gen/s {self.metrics['generations_per_second']:.0f}",
+                 f"pop {self.metrics['population']}"]
+        lines += [f"{name} {ms:.1f}ms" for name, ms in self.metrics["phases_ms"].items()]
+        return lines
+
+    def update(self):
+        self.surface.fill(MenuLayout.BACKGROUND_COLOR)
+
+        line_height = self.font.get_linesize()
+        for index, line in enumerate(self.lines):
+            text_surface = self.font.render(line, True, MenuLayout.MAIN_COLOR)
+            self.surface.blit(text_surface, dest=(0, index * line_height))
+
+    def click(self) -> str:
+        return Actions.NONE.name
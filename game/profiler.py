@@ -0,0 +1,114 @@
+import json
+from collections import deque
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Optional, Deque
+
+
+class NullPhase(object):
+    """Context manager that does nothing, shared by every phase of the NullProfiler"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler(object):
+    """Profiler used when profiling is off, every method does nothing"""
+
+    enabled = False
+    null_phase = NullPhase()
+
+    def phase(self, name: str) -> NullPhase:
+        return self.null_phase
+
+    def end_frame(self, generations: int, population: int):
+        pass
+
+    def metrics(self) -> Dict:
+        return {}
+
+    def dump(self, metrics_file: Path):
+        pass
+
+
+class Phase(object):
+    """Context manager that adds the time spent inside it to a phase of the current frame"""
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + perf_counter() - self.start
+        return False
+
+
+class FrameProfiler(object):
+
+    enabled = True
+
+    def __init__(self, window_frames: int, callback: Optional[Callable[[Dict], None]] = None):
+        """Records how long every phase of the frames takes, together with the
+        population and the generation rate, over a rolling window of frames.
+
+        :param window_frames: Number of recent frames the metrics are computed over
+        :param callback: Called with the metrics at the end of every frame
+        """
+        self.window_frames = window_frames
+        self.callback = callback
+
+        self.current: Dict[str, float] = {}
+        self.phases: Dict[str, Deque[float]] = {}
+        self.frame_times: Deque[float] = deque(maxlen=window_frames)
+        self.generations: Deque[int] = deque(maxlen=window_frames)
+        self.population = 0
+
+    def phase(self, name: str) -> Phase:
+        """Times the code inside the returned context manager as part of a phase"""
+        return Phase(self, name)
+
+    def end_frame(self, generations: int, population: int):
+        """Closes the current frame.
+
+        :param generations: Number of generations stepped in the frame
+        :param population: Alive cells at the end of the frame
+        """
+        for name, seconds in self.current.items():
+            if name not in self.phases:
+                self.phases[name] = deque(maxlen=self.window_frames)
+            self.phases[name].append(seconds)
+        self.current = {}
+
+        self.frame_times.append(perf_counter())
+        self.generations.append(generations)
+        self.population = population
+
+        if self.callback is not None:
+            self.callback(self.metrics())
+
+    def metrics(self) -> Dict:
+        """Frame rate, generation rate, population and mean milliseconds per phase
+        over the window"""
+        elapsed = self.frame_times[-1] - self.frame_times[0] if len(self.frame_times) > 1 else 0.0
+        frames = len(self.frame_times) - 1
+        # The generations of the first frame were stepped before the window started
+        generations = sum(self.generations) - self.generations[0] if self.generations else 0
+
+        return {"fps": frames / elapsed if elapsed > 0 else 0.0,
+                "generations_per_second": generations / elapsed if elapsed > 0 else 0.0,
+                "population": self.population,
+                "phases_ms": {name: 1000 * sum(times) / len(times) for name, times in self.phases.items()}}
+
+    def dump(self, metrics_file: Path):
+        """Writes the current metrics to a JSON file"""
+        with open(metrics_file, "w") as f:
+            json.dump(self.metrics(), f, indent=2)
@@ -0,0 +1,77 @@
+from threading import Thread
+from time import perf_counter
+from typing import Callable, Optional
+
+
+class Scheduler(object):
+
+    def __init__(self, step_budget: float):
+        """Fixed timestep scheduler that decouples the simulation rate from the
+        render rate. Generations are accumulated at the current speed and as
+        many as are due run on every update, within a time budget.
+
+        :param step_budget: Maximum seconds spent stepping in a single update
+        """
+        self.step_budget = step_budget
+        self.pending = 0.0
+        self.last_time: Optional[float] = None
+
+    def reset(self):
+        """Forgets the elapsed time, so a resumed simulation doesn't run a burst
+        of generations for the time it was stopped"""
+        self.pending = 0.0
+        self.last_time = None
+
+    def update(self, speed: int, step: Callable[[], None]) -> int:
+        """Runs the generations that are due since the last update.
+
+        :param speed: Generations per second
+        :param step: Advances the simulation one generation
+        :return: Number of generations that were run
+        """
+        now = perf_counter()
+        if self.last_time is not None:
+            self.pending += (now - self.last_time) * speed
+        self.last_time = now
+
+        generations = 0
+        deadline = now + self.step_budget
+        while self.pending >= 1:
+            step()
+            self.pending -= 1
+            generations += 1
+
+            if perf_counter() >= deadline:
+                # Skip the generations that didn't fit in the frame instead of
+                # falling further behind on every frame
+                self.pending -= int(self.pending)
+                break
+
+        return generations
+
+
+class StepTask(Thread):
+
+    def __init__(self, scheduler: Scheduler, speed: int, step: Callable[[], None]):
+        """Runs the generations that are due on a worker thread, so the game loop
+        keeps handling events while a generation takes longer than a frame. The
+        game loop polls the task, and draws the board again once it is done.
+
+        :param scheduler: The scheduler that decides how many generations are due
+        :param speed: Generations per second
+        :param step: Advances the simulation one generation
+        """
+        super().__init__(daemon=True)
+        self.scheduler = scheduler
+        self.speed = speed
+        self.step = step
+
+        self.generations = 0
+        self.error: Optional[Exception] = None
+
+    def run(self):
+        try:
+            self.generations = self.scheduler.update(self.speed, self.step)
+        except Exception as error:
+            # Raised again on the game loop, once the task is polled
+            self.error = error
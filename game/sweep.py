@@ -0,0 +1,189 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, Future, wait, as_completed, FIRST_COMPLETED
+from itertools import product
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from game.configs import StepEngines
+from game.life import Grid, Rule, create_grid
+
+
+# Columns of the results file, in order
+RESULT_FIELDS = ("job", "seed", "columns", "rows", "density", "rule", "initial_population",
+                 "lifespan", "period", "final_population", "generations", "seconds")
+
+
+class SoupJob(NamedTuple):
+    """A random soup to simulate. The soup only depends on the sweep seed and the
+    job index, so an interrupted sweep can be resumed with the same results."""
+    job: int
+    seed: int
+    columns: int
+    rows: int
+    density: float
+    rule: str
+    max_generations: int
+    engine: str
+
+
+# Grids reused by every job of a worker process, keyed by board size, rule and engine
+worker_grids: Dict[Tuple[int, int, str, str], Grid] = {}
+# Buffers of random numbers and of alive cells reused by every soup of a size
+worker_buffers: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def soup_jobs(sizes: List[int], densities: List[float], rules: List[str], soups: int,
+              max_generations: int, engine: str = StepEngines.VECTORIZED.name, seed: int = 0) -> Iterator[SoupJob]:
+    """Iterates over every soup of a sweep, soups of them for every combination
+    of size, density and rule"""
+    combinations = product(sizes, densities, rules, range(soups))
+    for job, (size, density, rule, _) in enumerate(combinations):
+        yield SoupJob(job, seed, size, size, density, rule, max_generations, engine)
+
+
+def worker_grid(job: SoupJob) -> Grid:
+    key = (job.columns, job.rows, job.rule, job.engine)
+    if key not in worker_grids:
+        worker_grids[key] = create_grid(job.columns, job.rows, job.engine, rule=Rule.parse(job.rule))
+
+    return worker_grids[key]
+
+
+def fill_soup(grid: Grid, job: SoupJob):
+    """Fills the grid with the random soup of the job, reusing the buffers of the worker"""
+    key = (job.columns, job.rows)
+    if key not in worker_buffers:
+        worker_buffers[key] = np.empty(key, dtype=np.float64), np.empty(key, dtype=bool)
+    randoms, soup = worker_buffers[key]
+
+    rng = np.random.default_rng([job.seed, job.job])
+    rng.random(out=randoms)
+    np.less(randoms, job.density, out=soup)
+    grid.replace_state(soup.view(np.uint8))
+
+
+def run_soup(job: SoupJob) -> Dict:
+    """Simulates a soup until it becomes periodic or reaches the maximum number of
+    generations, and reports when and how it settled. Lifespan and period are
+    None when the soup was still evolving at the end."""
+    start = perf_counter()
+    grid = worker_grid(job)
+    fill_soup(grid, job)
+    initial_population = grid.population
+
+    if grid.cycles is None:
+        grid.enable_cycle_detection(job.max_generations)
+    else:
+        grid.cycles.reset(grid.state)
+
+    generations = 0
+    while generations < job.max_generations and grid.cycles.period is None:
+        grid.update_state()
+        generations += 1
+
+    return {"job": job.job, "seed": job.seed, "columns": job.columns, "rows": job.rows,
+            "density": job.density, "rule": job.rule, "initial_population": initial_population,
+            "lifespan": grid.cycles.cycle_start, "period": grid.cycles.period,
+            "final_population": grid.population, "generations": generations,
+            "seconds": perf_counter() - start}
+
+
+def drop_partial_line(output_file: Path):
+    """Removes the last line of a results file if the sweep was killed while writing it"""
+    if not output_file.exists():
+        return
+
+    with open(output_file, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def finished_jobs(output_file: Path) -> Set[int]:
+    """The jobs already in a results file, so a resumed sweep skips them"""
+    if not output_file.exists():
+        return set()
+
+    with open(output_file, newline="") as f:
+        if output_file.suffix == ".csv":
+            return {int(row["job"]) for row in csv.DictReader(f)}
+        return {json.loads(line)["job"] for line in f}
+
+
+class ResultsWriter(object):
+
+    def __init__(self, output_file: Path):
+        """Appends results to a CSV or JSONL file, depending on its extension,
+        flushing every one so they survive an interrupted sweep.
+
+        :param output_file: Where the results are written
+        """
+        new_file = not output_file.exists() or output_file.stat().st_size == 0
+        self.f = open(output_file, "a", newline="")
+        self.csv_writer: Optional[csv.DictWriter] = None
+
+        if output_file.suffix == ".csv":
+            self.csv_writer = csv.DictWriter(self.f, fieldnames=RESULT_FIELDS)
+            if new_file:
+                self.csv_writer.writeheader()
+
+    def write(self, result: Dict):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(result)
+        else:
+            self.f.write(json.dumps(result) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def run_sweep(jobs: Iterator[SoupJob], output_file: Path, processes: Optional[int] = None) -> int:
+    """Runs the soups on a pool of processes and streams every result to the
+    output file as soon as it is done. Jobs already in the file are skipped, and
+    only a few jobs per process are queued at a time, so sweeps of any size use
+    little memory.
+
+    :param jobs: The soups to simulate
+    :param output_file: A .csv or .jsonl file the results are appended to
+    :param processes: Number of worker processes, defaults to the number of CPUs
+    :return: Number of soups simulated
+    """
+    output_file = Path(output_file)
+    drop_partial_line(output_file)
+    done = finished_jobs(output_file)
+    pending_jobs = (job for job in jobs if job.job not in done)
+
+    writer = ResultsWriter(output_file)
+    simulated = 0
+    start = perf_counter()
+    try:
+        processes = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(processes) as executor:
+            queue_size = 4 * processes
+            running: Set[Future] = set()
+            for job in pending_jobs:
+                running.add(executor.submit(run_soup, job))
+                if len(running) < queue_size:
+                    continue
+
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    writer.write(future.result())
+                simulated += len(finished)
+
+            for future in as_completed(running):
+                writer.write(future.result())
+            simulated += len(running)
+    finally:
+        writer.close()
+
+    elapsed = perf_counter() - start
+    print(f"{simulated} soups in {elapsed:.1f}s, {len(done)} were already in {output_file}")
+
+    return simulated
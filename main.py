@@ -1,9 +1,64 @@
-from game import Engine
+import argparse
+from pathlib import Path
+
+from game import BoardConfig, StepEngines, Boundaries
+from game.batch import run_batch
+from game.life import Rule
 
 
 def main():
-    """Runs the game in a pygame window with default configurations"""
-    engine = Engine()
+    """Runs the game in a pygame window with default configurations, or
+    without a display when running in headless mode"""
+    parser = argparse.ArgumentParser(description="Conway's Game of Life")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run a board for a number of generations without a display")
+    parser.add_argument("--board", type=Path,
+                        help="Board file to load at start, as a path or a file name in the boards directory")
+    parser.add_argument("--generations", type=int, default=100,
+                        help="Number of generations to run in headless mode")
+    parser.add_argument("--output", type=Path,
+                        help="Where the final board is saved in headless mode")
+    parser.add_argument("--columns", type=int, default=BoardConfig.WIDTH)
+    parser.add_argument("--rows", type=int, default=BoardConfig.HEIGHT)
+    parser.add_argument("--engine", default=BoardConfig.ENGINE,
+                        choices=[engine.name for engine in StepEngines])
+    parser.add_argument("--grid-file", type=Path,
+                        help="File that holds the board state with the MEMMAP engine")
+    parser.add_argument("--rule", type=Rule.parse, default=BoardConfig.RULE,
+                        help="Life-like rule in B/S notation, such as B36/S23, or a name such as HIGHLIFE")
+    parser.add_argument("--boundary", default=BoardConfig.BOUNDARY,
+                        choices=[boundary.name for boundary in Boundaries],
+                        help="Whether the cells beyond the edges are dead, wrap around or mirror the edges")
+    parser.add_argument("--stop-on-cycle", action="store_true",
+                        help="Stop simulating once the board becomes periodic")
+    parser.add_argument("--profile", action="store_true",
+                        help="Show the frame rate, generation rate and time of every frame phase in the menu")
+    parser.add_argument("--metrics-file", type=Path,
+                        help="Where the profiling metrics are saved as JSON when the game is closed")
+    args = parser.parse_args()
+
+    if args.engine == StepEngines.MEMMAP.name and args.grid_file is None:
+        parser.error("--engine MEMMAP requires --grid-file")
+
+    if args.headless:
+        if args.board is None or args.output is None:
+            parser.error("--headless requires --board and --output")
+        if args.stop_on_cycle and args.engine == StepEngines.MEMMAP.name:
+            parser.error("--stop-on-cycle can't be used with the MEMMAP engine, it keeps a dense copy of the board")
+
+        run_batch(args.board, args.generations, args.output,
+                  columns=args.columns, rows=args.rows, engine=args.engine, grid_file=args.grid_file,
+                  stop_on_cycle=args.stop_on_cycle, rule=args.rule, boundary=args.boundary)
+        return
+
+    if args.output is not None or args.stop_on_cycle:
+        parser.error("--output and --stop-on-cycle can only be used with --headless")
+
+    # pygame is only imported when the game window is used
+    from game.engine import Engine
+    engine = Engine(profile=args.profile, metrics_file=args.metrics_file, rule=args.rule,
+                    boundary=args.boundary, columns=args.columns, rows=args.rows,
+                    engine=args.engine, grid_file=args.grid_file, board_file=args.board)
     engine.run_game(render=True)
 
 
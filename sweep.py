@@ -0,0 +1,40 @@
+import argparse
+from pathlib import Path
+
+from game import BoardConfig, StepEngines
+from game.sweep import soup_jobs, run_sweep
+
+
+# The memory mapped engine needs a file per board, the parallel engine would
+# start a pool inside every worker of the sweep, and Hashlife can't jump over
+# generations while the cycle detection looks at every one of them
+SWEEP_ENGINES = [engine.name for engine in StepEngines
+                 if engine not in (StepEngines.MEMMAP, StepEngines.PARALLEL, StepEngines.HASHLIFE)]
+
+
+def main():
+    """Simulates random soups of every combination of size, density and rule on
+    all the CPUs, and records their lifespan, period and final population"""
+    parser = argparse.ArgumentParser(description="Game of Life random soup sweep")
+    parser.add_argument("--output", type=Path, default=Path("sweep_results.jsonl"),
+                        help="A .csv or .jsonl file, an existing file is resumed")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.2, 0.35, 0.5])
+    parser.add_argument("--rules", nargs="+", default=[BoardConfig.RULE],
+                        help="Life-like rules in B/S notation or by name")
+    parser.add_argument("--soups", type=int, default=100,
+                        help="Number of soups of every combination of size, density and rule")
+    parser.add_argument("--max-generations", type=int, default=BoardConfig.CYCLE_GENERATIONS,
+                        help="Generations after which a soup that isn't periodic yet is stopped")
+    parser.add_argument("--engine", default=StepEngines.VECTORIZED.name, choices=SWEEP_ENGINES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, help="Number of worker processes, all the CPUs by default")
+    args = parser.parse_args()
+
+    jobs = soup_jobs(args.sizes, args.densities, args.rules, args.soups, args.max_generations,
+                     engine=args.engine, seed=args.seed)
+    run_sweep(jobs, args.output, args.processes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import Callable, Tuple
+
+import numpy as np
+import pytest
+
+from game.configs import Boundaries
+from game.life import Rule
+
+
+def random_soup(columns: int, rows: int, density: float = 0.35, seed: int = 0) -> np.ndarray:
+    """A board with each cell alive with probability `density`"""
+    return (np.random.default_rng(seed).random((columns, rows)) < density).astype(np.uint8)
+
+
+def reference_step(state: np.ndarray, rule: Rule, boundary: str) -> np.ndarray:
+    """One generation computed a cell at a time, as the rules are written"""
+    columns, rows = state.shape
+    new_state = np.zeros_like(state)
+    for x in range(columns):
+        for y in range(rows):
+            neighbours = 0
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    nx, ny = x + dx, y + dy
+                    if (dx, dy) == (0, 0):
+                        continue
+                    if boundary == Boundaries.TORUS.name:
+                        nx, ny = nx % columns, ny % rows
+                    elif boundary == Boundaries.MIRROR.name:
+                        nx, ny = min(max(nx, 0), columns - 1), min(max(ny, 0), rows - 1)
+                    elif not (0 <= nx < columns and 0 <= ny < rows):
+                        continue
+                    neighbours += state[nx, ny]
+
+            new_state[x, y] = rule.table[state[x, y], neighbours]
+
+    return new_state
+
+
+@lru_cache(maxsize=None)
+def reference_generations(columns: int, rows: int, rule: str, boundary: str,
+                          generations: int) -> Tuple[np.ndarray, ...]:
+    """A random soup and its next generations, computed once for every engine tested against them"""
+    states = [random_soup(columns, rows)]
+    for _ in range(generations):
+        states.append(reference_step(states[-1], Rule.parse(rule), boundary))
+
+    return tuple(states)
+
+
+@pytest.fixture
+def soup() -> Callable[..., np.ndarray]:
+    return random_soup
+
+
+@pytest.fixture
+def reference() -> Callable[..., Tuple[np.ndarray, ...]]:
+    return reference_generations
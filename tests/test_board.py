@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from game.configs import StepEngines, Renderers, BoardConfig
+
+pygame = pytest.importorskip("pygame")
+from game.board import Board  # noqa: E402
+
+
+WINDOW = (300, 200)
+
+
+def rendered_pixels(board: Board, generations) -> list:
+    window = pygame.Surface((WINDOW[0] + 10, WINDOW[1]))
+    frames = []
+    for state in generations:
+        board.grid.state = state
+        board.render(window, (10, 0))
+        frames.append(pygame.surfarray.array2d(window).copy())
+
+    return frames
+
+
+def generations(columns: int, rows: int):
+    board = Board(columns, rows, 10, WINDOW, engine=StepEngines.VECTORIZED.name)
+    board.grid.state = (np.random.default_rng(0).random((columns, rows)) < 0.3).astype(np.uint8)
+    states = [board.grid.state.copy()]
+    for _ in range(4):
+        board.update_state()
+        states.append(board.grid.state.copy())
+
+    # A frame with a single change, drawn cell by cell by the RECTS renderer
+    edited = states[-1].copy()
+    edited[0, 0] ^= 1
+    return states + [edited]
+
+
+@pytest.mark.parametrize("cell_side, size", [(10, (30, 20)), (10, (20, 12)), (1, (400, 300)), (3, (50, 90))])
+def test_renderers_draw_the_same_pixels(cell_side, size):
+    states = generations(*size)
+    frames = {}
+    for renderer in (Renderers.RECTS.name, Renderers.SURFARRAY.name):
+        board = Board(*size, cell_side, WINDOW, engine=StepEngines.VECTORIZED.name, renderer=renderer)
+        frames[renderer] = rendered_pixels(board, states)
+
+    for rects, surfarray in zip(frames[Renderers.RECTS.name], frames[Renderers.SURFARRAY.name]):
+        assert np.array_equal(rects, surfarray)
+
+
+def test_few_changes_are_drawn_cell_by_cell():
+    board = Board(30, 20, 10, WINDOW, engine=StepEngines.VECTORIZED.name, renderer=Renderers.RECTS.name)
+    window = pygame.Surface(WINDOW)
+    board.render(window, (0, 0))
+
+    board.grid.change_state(3, 4)
+    dirty_rects = board.render(window, (0, 0))
+    assert dirty_rects == [board.cell_rect(3, 4)]
+
+    board.grid.state[:] = 1
+    dirty_rects = board.render(window, (0, 0))
+    assert 30 * 20 > BoardConfig.MAX_DIRTY_RECTS
+    assert dirty_rects == [board.window.get_rect()]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from game.board_io import BoardBuffer, BoardTask
+from game.configs import StepEngines
+from game.life import create_grid
+
+
+def run_task(task: BoardTask) -> BoardTask:
+    task.start()
+    task.join()
+    return task
+
+
+def test_load_task_reads_the_board(tmp_path):
+    grid = create_grid(30, 20, StepEngines.VECTORIZED.name)
+    grid.state[5:8, 4] = 1
+    grid.save_board(tmp_path / "board.golb")
+
+    task = run_task(BoardTask(BoardBuffer(30, 20), save=False, board_path=tmp_path / "board.golb"))
+
+    assert task.error is None
+    assert task.progress == 1.0
+    assert np.array_equal(task.buffer.state, grid.state)
+
+
+def test_save_task_writes_the_snapshot(tmp_path):
+    state = np.zeros((30, 20), dtype=np.uint8)
+    state[1:3, 1:3] = 1
+    task = run_task(BoardTask(BoardBuffer(30, 20, state.copy()), save=True, board_path=tmp_path / "board.csv"))
+
+    grid = create_grid(30, 20, StepEngines.VECTORIZED.name)
+    grid.load_board(tmp_path / "board.csv")
+    assert task.error is None
+    assert np.array_equal(grid.state, state)
+
+
+@pytest.mark.parametrize("name, content", [("missing.csv", None), ("broken.golb", b"not a board")])
+def test_failed_task_keeps_the_error(tmp_path, name, content):
+    if content is not None:
+        (tmp_path / name).write_bytes(content)
+
+    task = run_task(BoardTask(BoardBuffer(30, 20), save=False, board_path=tmp_path / name))
+
+    assert task.error is not None
+    assert task.failure.startswith(f"Could not load {name}")
+
+
+def test_engine_goes_on_after_a_failed_load(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame = pytest.importorskip("pygame")
+    from game.engine import Engine
+
+    (tmp_path / "broken.golb").write_bytes(b"not a board")
+    monkeypatch.setattr("game.engine.ask_board_path", lambda save: str(tmp_path / "broken.golb"))
+
+    engine = Engine()
+    try:
+        engine.board.grid.state[1, 1] = 1
+        engine.load_board()
+        engine.board_task.join()
+        engine.poll_board_task()
+
+        assert engine.board_task is None
+        assert engine.board.grid.population == 1
+        assert "Could not load broken.golb" in capsys.readouterr().err
+        assert pygame.display.get_caption()[0].startswith("Game of Life - Could not load")
+    finally:
+        pygame.quit()
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from game.batch import run_batch
+from game.configs import StepEngines, Boundaries, BoardConfig
+from game.life import create_grid
+
+
+def run_until_periodic(grid, max_generations: int = 200):
+    grid.enable_cycle_detection(max_generations)
+    for _ in range(max_generations):
+        grid.update_state()
+        if grid.cycles.period is not None:
+            break
+
+    return grid.cycles.cycle_start, grid.cycles.period
+
+
+def test_blinker_has_period_two():
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    grid.state[4, 3:6] = 1
+
+    assert run_until_periodic(grid) == (0, 2)
+
+
+def test_block_is_a_still_life():
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    grid.state[4:6, 4:6] = 1
+
+    assert run_until_periodic(grid) == (0, 1)
+
+
+def test_pattern_that_settles_into_a_block():
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    # Three cells in an L become a block in one generation
+    grid.state[2, 2:4] = 1
+    grid.state[3, 2] = 1
+
+    assert run_until_periodic(grid) == (1, 1)
+
+
+def test_glider_on_a_torus_returns_after_crossing_it():
+    grid = create_grid(8, 8, StepEngines.VECTORIZED.name, boundary=Boundaries.TORUS.name)
+    grid.state[[1, 2, 0, 1, 2], [0, 1, 2, 2, 2]] = 1
+
+    assert run_until_periodic(grid) == (0, 32)
+
+
+def test_empty_board_is_detected():
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    grid.state[5, 5] = 1
+
+    assert run_until_periodic(grid) == (1, 1)
+
+
+def test_rewind_does_not_report_a_false_cycle(soup):
+    grid = create_grid(40, 30, StepEngines.VECTORIZED.name)
+    grid.state = soup(40, 30)
+    grid.enable_history(2 ** 20, keyframe_interval=4)
+    grid.enable_cycle_detection(1000)
+    for _ in range(5):
+        grid.update_state()
+
+    grid.rewind(1)
+    grid.update_state()
+
+    assert grid.cycles.period is None
+    assert grid.cycles.generation == 5
+
+
+def test_replaced_board_is_detected_from_scratch():
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    grid.state[4:6, 4:6] = 1
+    assert run_until_periodic(grid) == (0, 1)
+
+    blinker = np.zeros((10, 10), dtype=np.uint8)
+    blinker[4, 3:6] = 1
+    grid.replace_state(blinker)
+    for _ in range(2):
+        grid.update_state()
+
+    assert grid.cycles.period == 2
+
+
+def test_memmap_batch_rejects_cycle_detection(tmp_path):
+    with pytest.raises(ValueError):
+        run_batch(BoardConfig.BOARDS_DIR / "glider.csv", 10, tmp_path / "out.csv",
+                  engine=StepEngines.MEMMAP.name, grid_file=tmp_path / "board.grid", stop_on_cycle=True)
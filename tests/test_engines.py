@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from game.configs import StepEngines, Boundaries
+from game.life import Rule, Grid, MemmapGrid, UnboundedLife, create_grid
+
+
+COLUMNS, ROWS = 70, 23
+GENERATIONS = 6
+
+RULES = ["B3/S23", "B36/S23", "B2/S", "B3678/S34678", "B0123478/S01234678"]
+BOUNDED_ENGINES = [StepEngines.CELLS.name, StepEngines.VECTORIZED.name, StepEngines.BITPACKED.name,
+                   StepEngines.PARALLEL.name, StepEngines.MEMMAP.name, StepEngines.TILED.name]
+
+
+def bounded_grid(engine: str, rule: Rule, boundary: str, tmp_path) -> Grid:
+    if engine == StepEngines.MEMMAP.name:
+        # Small bands, so the halo rows between bands are exercised
+        return MemmapGrid(tmp_path / "board.grid", COLUMNS, ROWS, band_rows=5, rule=rule, boundary=boundary)
+
+    return create_grid(COLUMNS, ROWS, engine, rule=rule, boundary=boundary)
+
+
+@pytest.mark.parametrize("boundary", [boundary.name for boundary in Boundaries])
+@pytest.mark.parametrize("rule", RULES)
+@pytest.mark.parametrize("engine", BOUNDED_ENGINES)
+def test_engines_match_reference(engine, rule, boundary, reference, tmp_path):
+    if engine == StepEngines.CELLS.name and Rule.parse(rule).births_from_nothing:
+        pytest.skip("Sparse engines can't run rules with births from nothing")
+
+    generations = reference(COLUMNS, ROWS, rule, boundary, GENERATIONS)
+    grid = bounded_grid(engine, Rule.parse(rule), boundary, tmp_path)
+    try:
+        grid.state = generations[0].copy()
+        for generation, expected in enumerate(generations[1:], start=1):
+            grid.update_state()
+            assert np.array_equal(grid.state, expected), f"Generation {generation} differs"
+    finally:
+        grid.close()
+
+
+@pytest.mark.parametrize("engine", [StepEngines.CELLS.name, StepEngines.UNBOUNDED.name])
+def test_sparse_engines_reject_births_from_nothing(engine):
+    with pytest.raises(ValueError):
+        create_grid(COLUMNS, ROWS, engine, rule=Rule.parse("B0/S23"))
+
+
+def test_unbounded_engine_keeps_cells_beyond_the_board(soup):
+    state = soup(24, 24, seed=3)
+    plane = UnboundedLife.from_array(state)
+    grid = create_grid(24, 24, StepEngines.UNBOUNDED.name)
+    grid.state = state.copy()
+
+    for _ in range(30):
+        plane.step()
+        grid.update_state()
+        assert np.array_equal(grid.state, plane.to_array(0, 0, 24, 24))
+
+
+def test_tiled_engine_skips_stable_tiles():
+    grid = create_grid(128, 128, StepEngines.TILED.name)
+    # A blinker in the top left tile, the rest of the board is empty
+    grid.state[1:4, 2] = 1
+    for _ in range(3):
+        grid.update_state()
+
+    assert grid.tiles.active_tiles <= 4
+    assert grid.population == 3
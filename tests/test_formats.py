@@ -0,0 +1,126 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from game.board_io import BoardBuffer
+from game.configs import StepEngines, BoardConfig
+from game.life import Grid, MemmapGrid, Rule, create_grid, formats
+from game.life.formats import FORMAT_EXTENSIONS
+
+
+COLUMNS, ROWS = 70, 23
+
+
+def make_grid(engine: str, tmp_path, name: str = "board.grid") -> Grid:
+    if engine == StepEngines.MEMMAP.name:
+        return MemmapGrid(tmp_path / name, COLUMNS, ROWS, band_rows=4)
+
+    return create_grid(COLUMNS, ROWS, engine)
+
+
+@pytest.mark.parametrize("chunk_cells", [formats.CHUNK_CELLS, 3 * COLUMNS, 1])
+@pytest.mark.parametrize("extension", list(FORMAT_EXTENSIONS))
+@pytest.mark.parametrize("engine", [StepEngines.VECTORIZED.name, StepEngines.BITPACKED.name,
+                                    StepEngines.MEMMAP.name])
+def test_round_trip(engine, extension, chunk_cells, soup, tmp_path, monkeypatch):
+    monkeypatch.setattr(formats, "CHUNK_CELLS", chunk_cells)
+    state = soup(COLUMNS, ROWS, 0.3)
+    board_file = tmp_path / f"board{extension}"
+
+    grid = make_grid(engine, tmp_path)
+    grid.state = state
+    grid.save_board(board_file)
+
+    loaded = make_grid(engine, tmp_path, "loaded.grid")
+    loaded.load_board(board_file)
+
+    assert np.array_equal(loaded.state, state)
+
+
+@pytest.mark.parametrize("extension", list(FORMAT_EXTENSIONS))
+def test_empty_rows_at_the_edges(extension, tmp_path):
+    state = np.zeros((COLUMNS, ROWS), dtype=np.uint8)
+    state[10:15, 5] = 1
+    state[COLUMNS - 1, 12] = 1
+    board_file = tmp_path / f"board{extension}"
+
+    grid = create_grid(COLUMNS, ROWS, StepEngines.VECTORIZED.name)
+    grid.state = state
+    grid.save_board(board_file)
+    grid.load_board(board_file)
+
+    assert np.array_equal(grid.state, state)
+
+
+def test_read_rle_pattern(tmp_path):
+    board_file = tmp_path / "glider.rle"
+    board_file.write_text("#N Glider\nx = 3, y = 3, rule = B3/S23\nbob$2bo$3o!\n")
+
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    grid.load_board(board_file)
+
+    expected = np.zeros((10, 10), dtype=np.uint8)
+    expected[[1, 2, 0, 1, 2], [0, 1, 2, 2, 2]] = 1
+    assert np.array_equal(grid.state, expected)
+
+
+def test_smaller_board_is_loaded_in_the_corner():
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    grid.load_board(BoardConfig.BOARDS_DIR / "glider.csv")
+
+    assert grid.population == 5
+    assert not grid.state[3:].any() and not grid.state[:, 3:].any()
+
+
+@pytest.mark.parametrize("extension", list(FORMAT_EXTENSIONS))
+def test_format_is_detected_without_extension(extension, soup, tmp_path):
+    grid = create_grid(COLUMNS, ROWS, StepEngines.VECTORIZED.name)
+    grid.state = soup(COLUMNS, ROWS, 0.3)
+    grid.save_board(tmp_path / f"board{extension}")
+
+    renamed = tmp_path / "board"
+    (tmp_path / f"board{extension}").rename(renamed)
+
+    assert formats.detect_format(renamed) == FORMAT_EXTENSIONS[extension]
+
+
+def test_rle_header_has_the_rule_of_the_grid(tmp_path):
+    grid = create_grid(10, 10, StepEngines.VECTORIZED.name, rule=Rule.parse("HIGHLIFE"))
+    grid.save_board(tmp_path / "board.rle")
+
+    assert (tmp_path / "board.rle").read_text().startswith("x = 10, y = 10, rule = B36/S23\n")
+
+    buffer = BoardBuffer(10, 10, grid.state, rule=Rule.parse("SEEDS"))
+    formats.write_board(buffer, tmp_path / "buffer.rle")
+    assert formats.rle_rule(tmp_path / "buffer.rle") == "B2/S"
+
+
+def test_reading_a_pattern_of_another_rule_warns(tmp_path):
+    board_file = tmp_path / "board.rle"
+    board_file.write_text("#C HighLife replicator\nx = 3, y = 3, rule = B36/S23\nbob$2bo$3o!\n")
+
+    with pytest.warns(UserWarning, match="B36/S23"):
+        create_grid(10, 10, StepEngines.VECTORIZED.name).load_board(board_file)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        create_grid(10, 10, StepEngines.VECTORIZED.name, rule=Rule.parse("b36/s23")).load_board(board_file)
+
+
+@pytest.mark.parametrize("chunk_cells", [formats.CHUNK_CELLS, 1])
+def test_read_csv_values_like_csv_reader(chunk_cells, tmp_path, monkeypatch):
+    monkeypatch.setattr(formats, "CHUNK_CELLS", chunk_cells)
+    board_file = tmp_path / "board.csv"
+    # Quoted values, values other than 0 and 1, rows longer and shorter than
+    # the board, an empty row, mixed line ends and fewer rows than the board
+    board_file.write_bytes(b'0,1,"1",10,2,1,1\r\n1\n\n,1,,1\r\n')
+
+    grid = create_grid(5, 6, StepEngines.VECTORIZED.name)
+    grid.load_board(board_file)
+
+    expected = np.zeros((5, 6), dtype=np.uint8)
+    expected[[1, 2], 0] = 1
+    expected[0, 1] = 1
+    expected[[1, 3], 3] = 1
+    assert np.array_equal(grid.state, expected)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from game.batch import run_batch
+from game.configs import StepEngines, BoardConfig, Boundaries
+from game.life import HashLife, UnboundedLife, Rule, create_grid
+
+
+def glider_gun() -> np.ndarray:
+    grid = create_grid(BoardConfig.WIDTH, BoardConfig.HEIGHT, StepEngines.VECTORIZED.name)
+    grid.load_board(BoardConfig.BOARDS_DIR / "glider_gun.csv")
+    return grid.state
+
+
+@pytest.mark.parametrize("generations", [1, 2, 37, 256, 1000])
+def test_hashlife_matches_unbounded_life(generations):
+    state = glider_gun()
+    hashlife = HashLife.from_array(state)
+    plane = UnboundedLife.from_array(state)
+
+    hashlife.step(generations)
+    plane.step(generations)
+
+    assert hashlife.population == plane.population
+    assert hashlife.bounding_box() == plane.bounding_box()
+    assert set(hashlife.cells()) == set(plane.cells())
+
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23", "B3678/S34678"])
+def test_hashlife_runs_other_rules(rule, soup):
+    state = soup(24, 24, 0.4, seed=1)
+    hashlife = HashLife.from_array(state, origin=(-5, 7), rule=Rule.parse(rule))
+    plane = UnboundedLife.from_array(state, origin=(-5, 7), rule=Rule.parse(rule))
+
+    for generations in (1, 3, 16):
+        hashlife.step(generations)
+        plane.step(generations)
+        assert set(hashlife.cells()) == set(plane.cells())
+
+
+def test_hashlife_engine_matches_unbounded_engine():
+    hashlife = create_grid(BoardConfig.WIDTH, BoardConfig.HEIGHT, StepEngines.HASHLIFE.name)
+    unbounded = create_grid(BoardConfig.WIDTH, BoardConfig.HEIGHT, StepEngines.UNBOUNDED.name)
+    hashlife.state = glider_gun()
+    unbounded.state = glider_gun()
+
+    hashlife.advance(300)
+    for _ in range(300):
+        unbounded.update_state()
+    assert np.array_equal(hashlife.state, unbounded.state)
+
+    # Stepping one generation at a time keeps the plane between calls
+    for _ in range(5):
+        hashlife.update_state()
+        unbounded.update_state()
+    assert np.array_equal(hashlife.state, unbounded.state)
+
+
+def test_hashlife_engine_has_no_edges():
+    with pytest.raises(ValueError):
+        create_grid(10, 10, StepEngines.HASHLIFE.name, boundary=Boundaries.TORUS.name)
+
+
+def test_hashlife_batch_matches_unbounded_batch(tmp_path):
+    hashlife = run_batch("glider_gun.csv", 500, tmp_path / "hashlife.rle", engine=StepEngines.HASHLIFE.name)
+    unbounded = run_batch("glider_gun.csv", 500, tmp_path / "unbounded.rle", engine=StepEngines.UNBOUNDED.name)
+
+    assert np.array_equal(hashlife.state, unbounded.state)
+    assert (tmp_path / "hashlife.rle").read_text() == (tmp_path / "unbounded.rle").read_text()
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+from game.configs import StepEngines
+from game.life import History, create_grid
+
+
+@pytest.mark.parametrize("engine", [StepEngines.VECTORIZED.name, StepEngines.BITPACKED.name,
+                                    StepEngines.TILED.name])
+def test_rewind_returns_previous_generations(engine, soup):
+    grid = create_grid(40, 30, engine)
+    grid.state = soup(40, 30)
+    grid.enable_history(2 ** 20, keyframe_interval=4)
+
+    generations = [grid.state.copy()]
+    for _ in range(10):
+        grid.update_state()
+        generations.append(grid.state.copy())
+
+    grid.rewind(3)
+    assert np.array_equal(grid.state, generations[7])
+    grid.rewind(1)
+    assert np.array_equal(grid.state, generations[6])
+
+    # The generations after a rewind are stepped again from there
+    grid.update_state()
+    assert np.array_equal(grid.state, generations[7])
+
+
+def test_rewind_stops_at_the_oldest_generation(soup):
+    grid = create_grid(40, 30, StepEngines.VECTORIZED.name)
+    grid.state = soup(40, 30)
+    first = grid.state.copy()
+    grid.enable_history(2 ** 20, keyframe_interval=4)
+    for _ in range(5):
+        grid.update_state()
+
+    grid.rewind(100)
+    assert np.array_equal(grid.state, first)
+
+
+def test_history_stays_within_budget(soup):
+    states = [soup(40, 30, seed=seed) for seed in range(50)]
+    keyframe_bytes = np.packbits(states[0]).nbytes
+    history = History(max_bytes=10 * keyframe_bytes, keyframe_interval=3)
+    for state in states:
+        history.record(state)
+
+    assert history.size_bytes <= 10 * keyframe_bytes
+    assert history.first_generation > 0
+    assert np.array_equal(history.state_at(history.generation - 2), states[-3])
+    # The oldest frame left is always a keyframe
+    assert history.frames[0][0]
+
+
+def blinker_grid(engine: str = StepEngines.VECTORIZED.name):
+    grid = create_grid(10, 10, engine)
+    grid.state[4, 3:6] = 1
+    grid.enable_history(2 ** 20, keyframe_interval=4)
+    for _ in range(3):
+        grid.update_state()
+
+    return grid
+
+
+@pytest.mark.parametrize("engine", [StepEngines.VECTORIZED.name, StepEngines.BITPACKED.name])
+def test_rewind_stops_at_a_replaced_board(engine):
+    grid = blinker_grid(engine)
+    block = np.zeros((10, 10), dtype=np.uint8)
+    block[1:3, 1:3] = 1
+
+    grid.replace_state(block.copy())
+    grid.update_state()
+    grid.rewind(1)
+    assert np.array_equal(grid.state, block)
+
+    # The generations of the previous board are gone
+    grid.rewind(1)
+    assert np.array_equal(grid.state, block)
+
+
+def test_rewind_stops_at_a_loaded_board(tmp_path):
+    block = create_grid(10, 10, StepEngines.VECTORIZED.name)
+    block.state[1:3, 1:3] = 1
+    block.save_board(tmp_path / "block.rle")
+
+    grid = blinker_grid()
+    grid.load_board(tmp_path / "block.rle")
+    grid.update_state()
+    grid.rewind(1)
+
+    assert np.array_equal(grid.state, block.state)
+
+
+@pytest.mark.parametrize("engine", [StepEngines.VECTORIZED.name, StepEngines.BITPACKED.name])
+def test_rewind_stops_at_a_cleared_board(engine):
+    grid = blinker_grid(engine)
+    grid.reset()
+    grid.update_state()
+    grid.rewind(1)
+
+    assert grid.population == 0
+
+
+@pytest.mark.parametrize("engine", [StepEngines.VECTORIZED.name, StepEngines.BITPACKED.name])
+def test_edits_are_part_of_the_current_generation(engine):
+    grid = blinker_grid(engine)
+    previous = grid.history.state_at(grid.history.generation - 1)
+
+    grid.change_state(0, 0)
+    edited = grid.state.copy()
+    grid.update_state()
+
+    grid.rewind(1)
+    assert np.array_equal(grid.state, edited)
+    grid.rewind(1)
+    assert np.array_equal(grid.state, previous)
+
+
+@pytest.mark.parametrize("max_bytes", [1024, 16])
+def test_newest_generation_can_always_be_rewound_to(max_bytes):
+    grid = create_grid(64, 64, StepEngines.VECTORIZED.name)
+    grid.state[[1, 2, 0, 1, 2], [0, 1, 2, 2, 2]] = 1
+    grid.enable_history(max_bytes, keyframe_interval=64)
+
+    for _ in range(100):
+        grid.update_state()
+        assert np.array_equal(grid.history.state_at(grid.history.generation), grid.state)
+
+    if max_bytes >= np.packbits(grid.state).nbytes:
+        assert grid.history.size_bytes <= max_bytes
+        # A glider moves, so the generation before the last is still there
+        previous = grid.history.state_at(grid.history.generation - 1)
+        grid.rewind(1)
+        assert np.array_equal(grid.state, previous)
+
+
+def test_rewound_unbounded_board_steps_from_the_board_rewound_to():
+    grid = create_grid(10, 10, StepEngines.UNBOUNDED.name)
+    # A vertical blinker on the right edge, half of its phases lie beyond the board
+    grid.state[9, 3:6] = 1
+    blinker = grid.state.copy()
+    grid.enable_history(2 ** 20, keyframe_interval=4)
+
+    grid.update_state()
+    grid.update_state()
+    grid.rewind(1)
+    grid.update_state()
+
+    assert np.array_equal(grid.state, blinker)
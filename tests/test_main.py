@@ -0,0 +1,35 @@
+import sys
+
+import pytest
+
+import main
+from game.configs import StepEngines
+
+
+def run_main(monkeypatch, *args: str):
+    monkeypatch.setattr(sys, "argv", ["main.py", *args])
+    main.main()
+
+
+@pytest.mark.parametrize("args", [["--output", "result.csv"], ["--stop-on-cycle"],
+                                  ["--engine", StepEngines.MEMMAP.name]])
+def test_options_the_window_can_not_use_are_rejected(args, monkeypatch):
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, *args)
+
+
+def test_window_opens_the_board_with_the_engine(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame = pytest.importorskip("pygame")
+    from game.engine import Engine
+
+    engines = []
+    monkeypatch.setattr(Engine, "run_game", lambda engine, render: engines.append(engine))
+    try:
+        run_main(monkeypatch, "--board", "glider.csv", "--engine", StepEngines.TILED.name)
+
+        grid = engines[0].board.grid
+        assert grid.engine == StepEngines.TILED.name
+        assert grid.population == 5
+    finally:
+        pygame.quit()
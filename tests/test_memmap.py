@@ -0,0 +1,42 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from game.life import MemmapGrid, Rule, create_grid
+
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23"])
+def test_step_stays_within_the_band_budget(rule, soup, tmp_path, monkeypatch):
+    monkeypatch.setattr(MemmapGrid, "BAND_BYTES", 2 ** 20)
+    grid = MemmapGrid(tmp_path / "board.grid", 6400, 300, rule=Rule.parse(rule))
+    assert grid.band_rows < grid.rows
+
+    grid.state = soup(6400, 300, 0.3)
+    tracemalloc.start()
+    try:
+        grid.update_state()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak <= MemmapGrid.BAND_BYTES
+
+
+def test_grid_file_is_reopened_at_its_generation(tmp_path):
+    grid = MemmapGrid(tmp_path / "board.grid", 100, 50, band_rows=7)
+    grid.state[:] = 0
+    grid.change_state(10, 10)
+    grid.change_state(11, 10)
+    grid.change_state(12, 10)
+    grid.update_state()
+
+    reopened = MemmapGrid.open(tmp_path / "board.grid")
+    assert reopened.generation == 1
+    assert np.array_equal(reopened.state, grid.state)
+    assert reopened.population == 3
+
+
+def test_memmap_engine_needs_a_grid_file():
+    with pytest.raises(ValueError):
+        create_grid(10, 10, "MEMMAP")
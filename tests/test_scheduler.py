@@ -0,0 +1,64 @@
+from threading import Event
+
+import pytest
+
+from game.scheduler import Scheduler, StepTask
+
+
+def due_scheduler(generations: int) -> Scheduler:
+    scheduler = Scheduler(step_budget=60.0)
+    scheduler.pending = float(generations)
+    return scheduler
+
+
+def test_step_task_runs_off_the_calling_thread():
+    release = Event()
+    task = StepTask(due_scheduler(1), speed=1, step=release.wait)
+    task.start()
+
+    # The caller goes on while the generation is still being stepped
+    assert task.is_alive()
+    release.set()
+    task.join(timeout=5)
+
+    assert not task.is_alive()
+    assert task.generations == 1
+
+
+def test_step_task_keeps_the_error():
+    def fail():
+        raise RuntimeError("broken step")
+
+    task = StepTask(due_scheduler(3), speed=1, step=fail)
+    task.start()
+    task.join(timeout=5)
+
+    assert isinstance(task.error, RuntimeError)
+
+
+def test_engine_handles_frames_during_a_long_generation(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame = pytest.importorskip("pygame")
+    from game.engine import Engine
+
+    engine = Engine()
+    release = Event()
+    stepped = []
+    monkeypatch.setattr(engine.board, "update_state", lambda: stepped.append(release.wait()))
+    try:
+        engine.board.grid.state[1, 1] = 1
+        engine.start_step(due_scheduler(1))
+
+        # Frames go on without the board while the generation runs
+        assert engine.poll_step_task() == 0
+        engine.render()
+        assert engine.step_task is not None
+
+        release.set()
+        engine.clear_board()
+        assert engine.step_task is None
+        assert stepped == [True]
+        assert engine.board.grid.population == 0
+    finally:
+        release.set()
+        pygame.quit()